@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from pathlib import Path
+import json
 import sys
 
-from session_reader import SessionReader
-from utils.doc_reader import IDSEDocReader
-from utils.sync_detector import SyncDetector
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from session_reader import SessionReader  # noqa: E402
+from utils.doc_reader import IDSEDocReader  # noqa: E402
+from utils.governance_state import GovernanceStateStore  # noqa: E402
+from utils.sync_detector import SyncDetector, report_new_commits  # noqa: E402
 
 
 def show_session_info(base_dir: Path = Path(".")) -> None:
@@ -38,9 +44,17 @@ def show_session_info(base_dir: Path = Path(".")) -> None:
             print(f"• {label}: not found")
 
 
-def show_sync_status(base_dir: Path = Path("."), show_changes: bool = False) -> None:
-    """Print whether Agency has updated artifacts for the active session."""
+def show_sync_status(
+    base_dir: Path = Path("."), show_changes: bool = False, since_last: bool = False
+) -> None:
+    """Print whether Agency has updated artifacts for the active session.
+
+    With since_last, report every commit since the previous --since-last run.
+    """
     detector = SyncDetector(base_dir=base_dir)
+    if since_last:
+        report_new_commits(detector.detect_new_commits(), show_changes)
+        return
     result = detector.detect_agency_updates()
 
     if not result.get("has_updates"):
@@ -63,9 +77,33 @@ def show_sync_status(base_dir: Path = Path("."), show_changes: bool = False) ->
             print("No changed artifacts listed.")
 
 
+def run_state_command(args: list[str]) -> None:
+    """view / handoff / role / history / compact against the governance state store."""
+    store = GovernanceStateStore()
+    cmd = args[0]
+    if cmd == "view":
+        print(json.dumps(store.current(), indent=2))
+    elif cmd == "handoff":
+        frm, to, *reason = args[1:]
+        store.handoff(frm, to, " ".join(reason))
+        print(f"Handoff recorded: {frm} → {to}")
+    elif cmd == "role":
+        store.role(args[1])
+        print(f"Role changed → {args[1]}")
+    elif cmd == "history":
+        for event in store.history(since=args[1] if len(args) > 1 else None):
+            data = event["data"]
+            print(f"{event['timestamp']}  {data['from']} → {data['to']}  {data.get('reason', '')}")
+    elif cmd == "compact":
+        position = store.compact()
+        print(f"Compacted state.json through event {position['seq']}")
+
+
 if __name__ == "__main__":
     args = sys.argv[1:]
-    if args and args[0] == "sync":
-        show_sync_status(show_changes="--show-changes" in args)
+    if args and args[0] in ("view", "handoff", "role", "history", "compact"):
+        run_state_command(args)
+    elif args and args[0] == "sync":
+        show_sync_status(show_changes="--show-changes" in args, since_last="--since-last" in args)
     else:
         show_session_info()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 
-from backend.services.git_service import GitService, load_auth_config
+from backend.services.commit_queue import QueueFull, get_commit_queue
+from backend.services.git_service import CLIENT_POOL, commit_and_dispatch, load_auth_config
 
 router = APIRouter(prefix="/api/git", tags=["git"])
 
@@ -17,45 +19,45 @@ def auth_status():
         "app_configured": bool(
             cfg.app_id and cfg.app_private_key and cfg.app_installation_id
         ),
+        "client_cache": CLIENT_POOL.stats(),
     }
 
 
 @router.post("/commit")
-def commit_artifacts(payload: dict):
-    """Commit artifacts to a repository and optionally emit repository_dispatch."""
+def commit_artifacts(payload: dict, mode: str = "sync"):
+    """Commit artifacts to a repository and optionally emit repository_dispatch.
+
+    With `?mode=async` the commit is queued and a 202 with a job id is
+    returned immediately; poll `GET /api/git/jobs/{job_id}` for the outcome.
+    """
     required = ["session_id", "project", "repo_url", "branch", "artifacts"]
     missing = [r for r in required if r not in payload]
     if missing:
         raise HTTPException(status_code=400, detail=f"Missing fields: {', '.join(missing)}")
 
-    auth = load_auth_config()
-    service = GitService(auth)
+    if mode == "async":
+        try:
+            job = get_commit_queue().submit(payload)
+        except QueueFull as exc:
+            raise HTTPException(status_code=503, detail=str(exc))
+        return JSONResponse(
+            status_code=202,
+            content={
+                "job_id": job["job_id"],
+                "status": job["status"],
+                "status_url": f"/api/git/jobs/{job['job_id']}",
+            },
+        )
+    if mode != "sync":
+        raise HTTPException(status_code=400, detail=f"Unsupported mode: {mode}")
 
-    commit_sha = service.commit_artifacts(
-        repo_url=payload["repo_url"],
-        branch=payload["branch"],
-        artifacts=payload["artifacts"],
-        session_meta={"session_id": payload["session_id"], "project": payload["project"]},
-    )
+    return commit_and_dispatch(load_auth_config(), payload)
 
-    webhook_payload = {
-        "session_id": payload["session_id"],
-        "project": payload["project"],
-        "commit_sha": commit_sha,
-    }
 
-    dispatched = False
-    try:
-        dispatched = service.send_repository_dispatch(
-            repo_url=payload["repo_url"],
-            event_type="agency-update",
-            payload=webhook_payload,
-        )
-    except Exception:
-        dispatched = False
-
-    return {
-        "commit_sha": commit_sha,
-        "repository_dispatch_sent": dispatched,
-        "webhook_payload": webhook_payload,
-    }
+@router.get("/jobs/{job_id}")
+def commit_job_status(job_id: str):
+    """Report status, commit sha and dispatch result of a queued commit."""
+    job = get_commit_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
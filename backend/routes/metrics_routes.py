@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from utils import metrics
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+# The backend always collects; CLIs opt in with IDSE_METRICS / IDSE_METRICS_JSON.
+metrics.enable()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Latency histograms (GitHub API, git subprocesses, guardrails, file resolution)."""
+    return PlainTextResponse(metrics.REGISTRY.to_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
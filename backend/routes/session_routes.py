@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from utils.doc_reader import IDSEDocReader
+from utils.session_registry import get_session_registry
+
+router = APIRouter(prefix="/api/sessions", tags=["sessions"])
+
+STAGE_FILES = {
+    "intents": "intent.md",
+    "contexts": "context.md",
+    "specs": "spec.md",
+    "plans": "plan.md",
+    "tasks": "tasks.md",
+}
+
+
+def _session_or_404(project: str, session_id: str):
+    session = get_session_registry().get(project, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown session: {project}/{session_id}")
+    return session
+
+
+@router.get("")
+def list_sessions(
+    project: Optional[str] = None,
+    session_id: Optional[str] = None,
+    owner: Optional[str] = None,
+    stage: Optional[str] = None,
+    limit: int = 100,
+):
+    """Registered sessions filtered by project, session id, owner and stage."""
+    sessions = get_session_registry().query(
+        project=project, session_id=session_id, owner=owner, stage=stage, limit=limit
+    )
+    return {"count": len(sessions), "sessions": [session.to_dict() for session in sessions]}
+
+
+@router.post("")
+def register_session(payload: dict):
+    """Register (or replace) a session: the `.idse_active_session.json` shape plus `stage`."""
+    try:
+        session = get_session_registry().register(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return session.to_dict()
+
+
+@router.get("/{project}/{session_id}")
+def get_session(project: str, session_id: str):
+    return _session_or_404(project, session_id).to_dict()
+
+
+@router.patch("/{project}/{session_id}")
+def update_session(project: str, session_id: str, payload: dict):
+    """Change stage, owner, name or extra fields of a registered session."""
+    try:
+        session = get_session_registry().update(project, session_id, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown session: {project}/{session_id}")
+    return session.to_dict()
+
+
+@router.delete("/{project}/{session_id}")
+def remove_session(project: str, session_id: str):
+    if not get_session_registry().remove(project, session_id):
+        raise HTTPException(status_code=404, detail=f"Unknown session: {project}/{session_id}")
+    return {"removed": True}
+
+
+@router.get("/{project}/{session_id}/artifacts")
+def session_artifacts(project: str, session_id: str):
+    """Resolved artifact path per stage for this session (null when missing)."""
+    reader = IDSEDocReader(session=_session_or_404(project, session_id))
+    paths = {}
+    for stage_dir, filename in STAGE_FILES.items():
+        path = reader.resolve(stage_dir, filename)
+        paths[stage_dir] = str(path) if path else None
+    return {"project": project, "session_id": session_id, "artifacts": paths}
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Callable, Optional
+
+from backend.services.git_service import commit_and_dispatch, load_auth_config
+
+DEFAULT_DB_PATH = Path(".idse_cache") / "commit_jobs.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commit_jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    repo_url TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    commit_sha TEXT,
+    repository_dispatch_sent INTEGER,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner TEXT,
+    heartbeat REAL
+);
+CREATE INDEX IF NOT EXISTS commit_jobs_status ON commit_jobs(status);
+CREATE INDEX IF NOT EXISTS commit_jobs_repo ON commit_jobs(repo_url, status);
+"""
+
+# Live queues refresh their jobs' heartbeat this often; a queued or running
+# job whose heartbeat is older than STALE_SECONDS belongs to a dead process
+# and is taken over by whichever queue notices first.
+HEARTBEAT_SECONDS = 10.0
+STALE_SECONDS = 60.0
+# A job whose repo is busy in another process (or waits behind an older job
+# there) is retried this often.
+RETRY_SECONDS = 1.0
+
+# Claimed only if no job for the same repo is running or queued ahead of it,
+# in any process sharing the database.
+_CLAIM = """
+UPDATE commit_jobs SET status = 'running', heartbeat = ?, updated_at = ?
+WHERE job_id = ? AND status = 'queued' AND owner = ?
+  AND NOT EXISTS (
+    SELECT 1 FROM commit_jobs AS other
+    WHERE other.repo_url = commit_jobs.repo_url
+      AND (other.status = 'running' OR (other.status = 'queued' AND other.seq < commit_jobs.seq))
+  )
+"""
+
+
+class QueueFull(RuntimeError):
+    """Raised when too many commit jobs are already pending."""
+
+
+class CommitJobQueue:
+    """SQLite-backed commit job queue drained by a bounded worker pool.
+
+    Jobs are sharded onto workers by repo_url, and different repos proceed
+    in parallel. Several processes (e.g. uvicorn workers) may share the
+    database: each job is owned by the queue that submitted it, and a
+    worker claims a job with one conditional UPDATE that also requires no
+    running job and no older queued job for the same repo, so commits to
+    one repo run one at a time in submission order across processes and
+    no two workers run the same job. A job blocked that way is retried
+    every `retry_interval` seconds. Owners refresh a heartbeat on their jobs; jobs whose
+    owner stopped beating for `stale_after` seconds are taken over on
+    start() and by the heartbeat thread, so they survive restarts. A job
+    that was mid-flight in a dead process may therefore run twice; a
+    repeated commit just lands the same content again.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str = DEFAULT_DB_PATH,
+        runner: Optional[Callable[[dict], dict]] = None,
+        workers: int = 4,
+        max_pending: int = 1000,
+        heartbeat_interval: float = HEARTBEAT_SECONDS,
+        stale_after: float = STALE_SECONDS,
+        retry_interval: float = RETRY_SECONDS,
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.runner = runner or (lambda payload: commit_and_dispatch(load_auth_config(), payload))
+        self.max_pending = max_pending
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.retry_interval = retry_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(commit_jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+            if column not in columns:  # databases created before job ownership
+                self._conn.execute(f"ALTER TABLE commit_jobs ADD COLUMN {column} {kind}")
+        self._db_lock = threading.Lock()
+        self._shards = [queue.Queue() for _ in range(max(1, workers))]
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        for index, shard in enumerate(self._shards):
+            thread = threading.Thread(
+                target=self._work, args=(shard,), name=f"commit-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self.recover()
+        thread = threading.Thread(target=self._beat, name="commit-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def recover(self) -> int:
+        """Take over queued/running jobs whose owner's heartbeat is stale; returns how many."""
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")  # one recovering process at a time
+            try:
+                rows = self._conn.execute(
+                    "SELECT job_id, repo_url FROM commit_jobs "
+                    "WHERE status IN ('queued', 'running') AND (heartbeat IS NULL OR heartbeat < ?) "
+                    "ORDER BY seq",
+                    (now - self.stale_after,),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE commit_jobs SET status = 'queued', owner = ?, heartbeat = ?, updated_at = ? "
+                    "WHERE job_id = ?",
+                    [(self.owner, now, now, job_id) for job_id, _ in rows],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        for job_id, repo_url in rows:
+            self._shard(repo_url).put(job_id)
+        return len(rows)
+
+    def _beat(self) -> None:
+        while True:
+            time.sleep(self.heartbeat_interval)
+            try:
+                with self._db_lock:
+                    self._conn.execute(
+                        "UPDATE commit_jobs SET heartbeat = ? "
+                        "WHERE owner = ? AND status IN ('queued', 'running')",
+                        (time.time(), self.owner),
+                    )
+                self.recover()
+            except sqlite3.Error:
+                continue  # busy database; try again next beat
+
+    def _shard(self, repo_url: str) -> queue.Queue:
+        key = repo_url.rstrip("/").lower().encode("utf-8")
+        return self._shards[zlib.crc32(key) % len(self._shards)]
+
+    def pending(self) -> int:
+        with self._db_lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM commit_jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()
+        return count
+
+    def submit(self, payload: dict) -> dict:
+        if self.pending() >= self.max_pending:
+            raise QueueFull(f"Commit queue full ({self.max_pending} pending jobs)")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT INTO commit_jobs "
+                "(job_id, repo_url, payload, status, created_at, updated_at, owner, heartbeat) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, payload["repo_url"], json.dumps(payload), now, now, self.owner, now),
+            )
+        self._shard(payload["repo_url"]).put(job_id)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT job_id, repo_url, status, commit_sha, repository_dispatch_sent, "
+                "result, error, created_at, updated_at FROM commit_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, repo_url, status, sha, dispatched, result, error, created, updated = row
+        return {
+            "job_id": job_id,
+            "repo_url": repo_url,
+            "status": status,
+            "commit_sha": sha,
+            "repository_dispatch_sent": None if dispatched is None else bool(dispatched),
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "created_at": created,
+            "updated_at": updated,
+        }
+
+    def _update(self, job_id: str, **fields) -> None:
+        """Record a job's outcome, unless another queue has taken it over meanwhile."""
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._db_lock:
+            self._conn.execute(
+                f"UPDATE commit_jobs SET {assignments} WHERE job_id = ? AND owner = ?",
+                (*fields.values(), job_id, self.owner),
+            )
+
+    def _claim(self, job_id: str) -> tuple[Optional[dict], bool]:
+        """Atomically move one of our queued jobs to running.
+
+        Returns (payload, False) when claimed, (None, True) while its repo is
+        busy or an older job for it is queued, and (None, False) if the job
+        is no longer ours to run.
+        """
+        now = time.time()
+        with self._db_lock:
+            if self._conn.execute(_CLAIM, (now, now, job_id, self.owner)).rowcount == 1:
+                (payload,) = self._conn.execute(
+                    "SELECT payload FROM commit_jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                return json.loads(payload), False
+            row = self._conn.execute(
+                "SELECT 1 FROM commit_jobs WHERE job_id = ? AND status = 'queued' AND owner = ?",
+                (job_id, self.owner),
+            ).fetchone()
+        return None, row is not None
+
+    def _retry_later(self, shard: queue.Queue, job_id: str) -> None:
+        timer = threading.Timer(self.retry_interval, shard.put, (job_id,))
+        timer.daemon = True
+        timer.start()
+
+    def _work(self, shard: queue.Queue) -> None:
+        while True:
+            job_id = shard.get()
+            payload, blocked = self._claim(job_id)
+            if blocked:
+                self._retry_later(shard, job_id)
+                continue
+            if payload is None:
+                continue
+            try:
+                result = self.runner(payload)
+            except Exception as exc:
+                self._update(job_id, status="failed", error=f"{type(exc).__name__}: {exc}")
+                continue
+            self._update(
+                job_id,
+                status="succeeded",
+                commit_sha=result.get("commit_sha"),
+                repository_dispatch_sent=int(bool(result.get("repository_dispatch_sent"))),
+                result=json.dumps(result),
+            )
+
+
+_QUEUE: Optional[CommitJobQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_commit_queue() -> CommitJobQueue:
+    """Return the process-wide queue, creating and starting it on first use."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = CommitJobQueue(
+                db_path=os.getenv("IDSE_COMMIT_QUEUE_DB", str(DEFAULT_DB_PATH)),
+                workers=int(os.getenv("IDSE_COMMIT_WORKERS", "4")),
+                max_pending=int(os.getenv("IDSE_COMMIT_QUEUE_MAX", "1000")),
+            )
+            _QUEUE.start()
+        return _QUEUE
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import hashlib
 import os
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
-from github import Github, GithubIntegration, InputGitTreeElement
+from utils.metrics import COMMIT_SECONDS, GITHUB_API_SECONDS, span, timed
+
+
+def _pygithub():
+    """Import PyGithub on first use; it dominates the backend's import time."""
+    import github
+
+    return github
 
 
 @dataclass
@@ -17,6 +29,18 @@ class GitAuthConfig:
     app_installation_id: Optional[str] = None
 
 
+@dataclass
+class CommitResult:
+    sha: str
+    api_calls: int
+    inline_blobs: int
+    created_blobs: int
+    elapsed_ms: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
 def load_auth_config() -> GitAuthConfig:
     """Load GitHub auth settings from environment variables."""
     mode = os.getenv("GITHUB_AUTH_MODE", "pat").lower()
@@ -29,32 +53,133 @@ def load_auth_config() -> GitAuthConfig:
     )
 
 
-class GitService:
-    """Lightweight GitHub commit/dispatch helper."""
+def _fingerprint(secret: Optional[str]) -> str:
+    return hashlib.sha256((secret or "").encode("utf-8")).hexdigest()[:16]
 
-    def __init__(self, auth: GitAuthConfig):
-        self.auth = auth
-        self.client = self._build_client(auth)
 
-    def _build_client(self, auth: GitAuthConfig):
+@dataclass
+class _CachedClient:
+    client: Any
+    expires_at: Optional[datetime] = None  # None: never expires (PAT)
+
+
+class GitClientPool:
+    """Process-wide cache of GitHub clients and installation tokens.
+
+    Keyed by auth mode, a fingerprint of the credential and the installation
+    id, so raw secrets never become dict keys. App installation tokens are
+    re-minted REFRESH_MARGIN before they expire. A per-key lock means
+    concurrent requests (FastAPI runs sync handlers on a threadpool) mint at
+    most one token per key. Separate worker processes each keep their own
+    pool.
+    """
+
+    REFRESH_MARGIN = timedelta(minutes=5)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple, threading.Lock] = {}
+        self._clients: dict[tuple, _CachedClient] = {}
+        self._integrations: dict[tuple, Any] = {}
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0}
+
+    @staticmethod
+    def _key(auth: GitAuthConfig) -> tuple:
+        if auth.mode == "app":
+            return ("app", auth.app_id, _fingerprint(auth.app_private_key), auth.app_installation_id)
+        return (auth.mode, _fingerprint(auth.pat))
+
+    def _is_fresh(self, entry: Optional[_CachedClient]) -> bool:
+        if entry is None:
+            return False
+        if entry.expires_at is None:
+            return True
+        return datetime.now(timezone.utc) < entry.expires_at - self.REFRESH_MARGIN
+
+    def get_client(self, auth: GitAuthConfig):
+        key = self._key(auth)
+        with self._lock:
+            entry = self._clients.get(key)
+            if self._is_fresh(entry):
+                self._stats["hits"] += 1
+                return entry.client
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have refreshed while we waited.
+            with self._lock:
+                current = self._clients.get(key)
+                if self._is_fresh(current):
+                    self._stats["hits"] += 1
+                    return current.client
+
+            fresh = self._mint(auth)
+            with self._lock:
+                self._clients[key] = fresh
+                self._stats["refreshes" if current else "misses"] += 1
+            return fresh.client
+
+    def _mint(self, auth: GitAuthConfig) -> _CachedClient:
         if auth.mode == "pat":
             if not auth.pat:
                 raise RuntimeError("GITHUB_PAT missing for pat mode")
-            return Github(auth.pat)
+            return _CachedClient(_pygithub().Github(auth.pat))
 
         if auth.mode == "app":
             if not (auth.app_id and auth.app_private_key and auth.app_installation_id):
                 raise RuntimeError("GitHub App configuration incomplete")
-            integ = GithubIntegration(auth.app_id, auth.app_private_key)
-            token = integ.get_access_token(int(auth.app_installation_id)).token
-            return Github(token)
+            integ_key = (auth.app_id, _fingerprint(auth.app_private_key))
+            with self._lock:
+                integ = self._integrations.get(integ_key)
+            if integ is None:
+                integ = _pygithub().GithubIntegration(auth.app_id, auth.app_private_key)
+                with self._lock:
+                    self._integrations[integ_key] = integ
+            with span(GITHUB_API_SECONDS, operation="get_access_token"):
+                access = integ.get_access_token(int(auth.app_installation_id))
+            expires_at = access.expires_at
+            if expires_at is not None and expires_at.tzinfo is None:
+                # Older PyGithub returns naive UTC datetimes.
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            return _CachedClient(_pygithub().Github(access.token), expires_at)
 
         raise RuntimeError(f"Unsupported GITHUB_AUTH_MODE: {auth.mode}")
 
+    def invalidate(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._integrations.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "cached_clients": len(self._clients)}
+
+
+CLIENT_POOL = GitClientPool()
+
+
+class GitService:
+    """Lightweight GitHub commit/dispatch helper."""
+
+    # Artifacts up to this size ride inline in the tree request; larger ones
+    # get their blobs created up front, concurrently.
+    INLINE_BLOB_LIMIT = 64 * 1024
+    MAX_BLOB_WORKERS = 4
+
+    def __init__(self, auth: GitAuthConfig):
+        self.auth = auth
+        self.client = self._build_client(auth)
+
+    def _build_client(self, auth: GitAuthConfig):
+        return CLIENT_POOL.get_client(auth)
+
     def _get_repo(self, repo_url: str):
         slug = repo_url.rstrip("/").split("github.com/")[-1]
-        return self.client.get_repo(slug)
+        # lazy=True skips the GET /repos/{slug} round trip; the first real
+        # call against the repo surfaces a missing repo just the same.
+        return self.client.get_repo(slug, lazy=True)
 
+    @timed(COMMIT_SECONDS)
     def commit_artifacts(
         self,
         repo_url: str,
@@ -62,41 +187,118 @@ class GitService:
         artifacts: dict[str, str],
         session_meta: dict,
         commit_message: Optional[str] = None,
-    ) -> str:
+    ) -> CommitResult:
         """
         Write artifacts and commit via GitHub API.
 
         artifacts: mapping alias -> local filesystem path to file contents.
-        """
-        repo = self._get_repo(repo_url)
-        ref = repo.get_git_ref(f"heads/{branch}")
-        latest_commit = repo.get_commit(ref.object.sha)
-        base_tree = repo.get_git_tree(latest_commit.sha)
 
-        tree_elements = []
+        API calls: get ref, get parent commit, one blob per large artifact
+        (in parallel), create tree, create commit, update ref.
+        """
+        started = time.perf_counter()
+        contents = {}
         for _, path in artifacts.items():
             file_path = Path(path)
             if not file_path.exists():
                 raise FileNotFoundError(f"Artifact not found: {file_path}")
-            content = file_path.read_text()
-            blob = repo.create_git_blob(content, "utf-8")
-            tree_elements.append(
-                InputGitTreeElement(
-                    path=str(path),
-                    mode="100644",
-                    type="blob",
-                    sha=blob.sha,
+            contents[str(path)] = file_path.read_text()
+
+        repo = self._get_repo(repo_url)
+        with span(GITHUB_API_SECONDS, operation="get_git_ref"):
+            ref = repo.get_git_ref(f"heads/{branch}")
+        with span(GITHUB_API_SECONDS, operation="get_git_commit"):
+            parent = repo.get_git_commit(ref.object.sha)
+        api_calls = 2
+
+        inline = {
+            path: content
+            for path, content in contents.items()
+            if len(content.encode("utf-8")) <= self.INLINE_BLOB_LIMIT
+        }
+        large = [path for path in contents if path not in inline]
+
+        blob_shas: dict[str, str] = {}
+        if large:
+            workers = min(self.MAX_BLOB_WORKERS, len(large))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                blobs = pool.map(lambda path: self._create_blob(repo, contents[path]), large)
+                blob_shas = {path: blob.sha for path, blob in zip(large, blobs)}
+            api_calls += len(large)
+
+        InputGitTreeElement = _pygithub().InputGitTreeElement
+        tree_elements = []
+        for path in contents:
+            if path in inline:
+                element = InputGitTreeElement(
+                    path=path, mode="100644", type="blob", content=inline[path]
+                )
+            else:
+                element = InputGitTreeElement(
+                    path=path, mode="100644", type="blob", sha=blob_shas[path]
                 )
-            )
+            tree_elements.append(element)
 
-        tree = repo.create_git_tree(tree=tree_elements, base_tree=base_tree)
+        # The parent's tree only needs its sha as base_tree; no extra fetch.
+        with span(GITHUB_API_SECONDS, operation="create_git_tree"):
+            tree = repo.create_git_tree(tree=tree_elements, base_tree=parent.tree)
         message = commit_message or f"docs: update IDSE artifacts [{session_meta.get('session_id')}]"
-        parent = repo.get_git_commit(latest_commit.sha)
-        commit = repo.create_git_commit(message, tree, [parent])
-        ref.edit(commit.sha)
-        return commit.sha
+        with span(GITHUB_API_SECONDS, operation="create_git_commit"):
+            commit = repo.create_git_commit(message, tree, [parent])
+        with span(GITHUB_API_SECONDS, operation="update_ref"):
+            ref.edit(commit.sha)
+        api_calls += 3
+
+        return CommitResult(
+            sha=commit.sha,
+            api_calls=api_calls,
+            inline_blobs=len(inline),
+            created_blobs=len(large),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    @staticmethod
+    def _create_blob(repo, content: str):
+        with span(GITHUB_API_SECONDS, operation="create_git_blob"):
+            return repo.create_git_blob(content, "utf-8")
 
     def send_repository_dispatch(self, repo_url: str, event_type: str, payload: dict) -> bool:
         repo = self._get_repo(repo_url)
-        repo.create_repository_dispatch(event_type, payload)
+        with span(GITHUB_API_SECONDS, operation="create_repository_dispatch"):
+            repo.create_repository_dispatch(event_type, payload)
         return True
+
+
+def commit_and_dispatch(auth: GitAuthConfig, payload: dict) -> dict:
+    """Commit a session's artifacts, then emit repository_dispatch (best effort)."""
+    service = GitService(auth)
+
+    result = service.commit_artifacts(
+        repo_url=payload["repo_url"],
+        branch=payload["branch"],
+        artifacts=payload["artifacts"],
+        session_meta={"session_id": payload["session_id"], "project": payload["project"]},
+    )
+
+    webhook_payload = {
+        "session_id": payload["session_id"],
+        "project": payload["project"],
+        "commit_sha": result.sha,
+    }
+
+    dispatched = False
+    try:
+        dispatched = service.send_repository_dispatch(
+            repo_url=payload["repo_url"],
+            event_type="agency-update",
+            payload=webhook_payload,
+        )
+    except Exception:
+        dispatched = False
+
+    return {
+        "commit_sha": result.sha,
+        "repository_dispatch_sent": dispatched,
+        "webhook_payload": webhook_payload,
+        "commit_stats": result.to_dict(),
+    }
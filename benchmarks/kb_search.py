@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Knowledge-base search benchmark
+
+Copies kb/playbooks, kb/examples and docs into a throwaway tree (repeated
+--copies times to simulate a larger corpus) and times KBSearchIndex: the
+cold build, loading the on-disk index in a fresh instance (alone and
+with the first query, which builds the postings), a no-op
+update, an update after one file changes, and query latency. Queries are
+built from the corpus's own section headings, so every one has hits.
+
+Usage:
+    python benchmarks/kb_search.py [--copies 1] [--queries 200] [--repeat 5] [-k 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils.kb_search import DEFAULT_ROOTS, KBSearchIndex, tokenize  # noqa: E402
+
+
+def build_tree(base: Path, copies: int) -> None:
+    for root in DEFAULT_ROOTS:
+        source = ROOT_DIR / root
+        for copy in range(copies):
+            target = base / root if copy == 0 else base / root / f"copy-{copy}"
+            shutil.copytree(source, target, dirs_exist_ok=True)
+
+
+def make_queries(index: KBSearchIndex, count: int, seed: int) -> list[str]:
+    words = sorted({term for _, record in index.sections() for term in tokenize(record["title"])})
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(words, min(len(words), rng.randint(1, 3)))) for _ in range(count)]
+
+
+def timed(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"median_ms": round(statistics.median(samples) * 1000, 3), "min_ms": round(min(samples) * 1000, 3)}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the kb/docs BM25 search index")
+    parser.add_argument("--copies", type=int, default=1, help="Times to replicate the corpus")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="idse-kb-") as tmp:
+        base = Path(tmp)
+        build_tree(base, args.copies)
+        files = [p for root in DEFAULT_ROOTS for p in (base / root).rglob("*.md")]
+        corpus_bytes = sum(p.stat().st_size for p in files)
+
+        def cold():
+            (base / KBSearchIndex.INDEX_PATH).unlink(missing_ok=True)
+            KBSearchIndex(base).update()
+
+        build = timed(cold, args.repeat)
+        load = timed(lambda: KBSearchIndex(base), args.repeat)
+        first_query = timed(lambda: KBSearchIndex(base).search("session validation"), args.repeat)
+        index = KBSearchIndex(base)
+        noop = timed(index.update, args.repeat)
+
+        target = files[0]
+        original = target.read_text()
+
+        def touch_one():
+            target.write_text(original + f"\n<!-- {time.perf_counter_ns()} -->\n")
+            changes = index.update()
+            assert changes["indexed"] == 1, changes
+
+        incremental = timed(touch_one, args.repeat)
+        target.write_text(original)
+        index.update()
+
+        queries = make_queries(index, args.queries, args.seed)
+        for query in queries[:10]:
+            index.search(query, k=args.k)  # warm-up
+        samples, hits = [], 0
+        for query in queries:
+            start = time.perf_counter()
+            hits += bool(index.search(query, k=args.k))
+            samples.append(time.perf_counter() - start)
+        index_bytes = (base / KBSearchIndex.INDEX_PATH).stat().st_size
+
+    report = {
+        "corpus": {
+            "files": len(files),
+            "bytes": corpus_bytes,
+            "sections": len(index),
+            "terms": len({term for _, record in index.sections() for term in record["terms"]}),
+            "index_bytes": index_bytes,
+        },
+        "build_cold": build,
+        "load_index": load,
+        "load_and_first_query": first_query,
+        "update_noop": noop,
+        "update_one_file": incremental,
+        "query": {
+            "queries": len(queries),
+            "k": args.k,
+            "with_hits": hits,
+            "p50_us": round(percentile(samples, 0.5) * 1e6, 1),
+            "p95_us": round(percentile(samples, 0.95) * 1e6, 1),
+            "max_us": round(max(samples) * 1e6, 1),
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Marker scanner benchmark
+
+Compares `find_requires_input(path.read_text())` with the memory-mapped
+`scan_markers` (full, capped and count-only) on a generated multi-megabyte
+plan, reporting wall time and peak Python heap (tracemalloc).
+
+Usage:
+    python benchmarks/marker_scan.py [--megabytes 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils.marker_scanner import scan_markers  # noqa: E402
+
+SCRIPTS = ROOT_DIR / "integrations" / "claude-skill" / "scripts"
+
+
+def load_script(name: str):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"seconds": round(elapsed, 4), "peak_mib": round(peak / 2**20, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the marker scanner")
+    parser.add_argument("--megabytes", type=int, default=32)
+    args = parser.parse_args()
+
+    validator = load_script("validate_artifacts")
+    plan = load_script("generate_artifact").TEMPLATES["plan"].replace("{timestamp}", "bench")
+    # Mostly-resolved filler with the template's markers sprinkled through it.
+    filler = "Resolved design notes for the component, no markers here.\n" * 200
+    block = plan + filler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "plan.md"
+        with open(path, "w") as handle:
+            written = 0
+            while written < args.megabytes * 2**20:
+                written += handle.write(block)
+
+        baseline, read_split = measure(lambda: validator.find_requires_input(path.read_text()))
+        full, mmap_full = measure(lambda: scan_markers(path))
+        capped, mmap_capped = measure(lambda: scan_markers(path, max_issues=5))
+        counted, mmap_count = measure(lambda: scan_markers(path, max_issues=0))
+
+    assert full.issues == baseline
+    assert capped.issues == baseline[:5]
+    assert counted.unresolved_count == len(baseline)
+    print(
+        json.dumps(
+            {
+                "megabytes": args.megabytes,
+                "issues": len(baseline),
+                "read_text_split": read_split,
+                "mmap_full": mmap_full,
+                "mmap_first_5": mmap_capped,
+                "mmap_count_only": mmap_count,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+IDSE toolchain benchmark suite
+
+Generates a synthetic repo (see synthetic_repo.py) and times the main
+entry points against it: IDSEDocReader resolution, validate_directory,
+validate_all_sessions, the guardrails, SyncDetector and PreCommitValidator.
+Each benchmark runs `--repeat` times; the median is what gets compared.
+
+Results are printed as JSON (and written to --output). With --baseline, any
+benchmark whose median exceeds the baseline median by more than
+--threshold (default 20%) is reported and the exit status is 1.
+
+Usage:
+    python benchmarks/run_suite.py [--projects 5 --sessions 20 --artifact-kb 8 --history 5000]
+        [--repeat 5] [--only validate_directory,sync_detect]
+        [--output results.json] [--baseline baseline.json --threshold 0.2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from guardrails.instruction_protection import evaluate_inputs, evaluate_operations  # noqa: E402
+from session_reader import SessionReader  # noqa: E402
+from utils.doc_reader import IDSEDocReader  # noqa: E402
+from utils.sync_detector import SyncDetector  # noqa: E402
+
+from synthetic_repo import STAGES, RepoConfig, build  # noqa: E402
+
+SCRIPTS = ROOT_DIR / "integrations" / "claude-skill" / "scripts"
+
+
+def load_module(name: str, path: Path):
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def suite(base: Path) -> dict[str, Callable[[], object]]:
+    """Benchmark name -> zero-argument callable doing one timed iteration."""
+    validator = load_module("validate_artifacts", SCRIPTS / "validate_artifacts.py")
+    pre_commit = load_module("pre_commit_check", ROOT_DIR / "scripts" / "pre_commit_check.py")
+
+    directory = str(base)
+    messages = [
+        (base / rel).read_text()
+        for rel in (p.relative_to(base) for p in sorted(base.glob("specs/projects/*/sessions/*/spec.md")))
+    ]
+    operations = [(str(p.relative_to(base)), "write") for p in sorted(base.glob("*/projects/*/sessions/*/*.md"))]
+
+    def doc_reader_resolve():
+        reader = IDSEDocReader(base_dir=base)
+        for _ in range(100):
+            for _, stage_dir, filename in STAGES:
+                reader.resolve(stage_dir, filename)
+
+    def doc_reader_cold():
+        SessionReader.invalidate()
+        IDSEDocReader(base_dir=base).resolve("specs", "spec.md")
+
+    def validate_all():
+        return list(validator.validate_all_sessions(directory, workers=2, use_cache=False))
+
+    def sync_watermark_cold():
+        detector = SyncDetector(base_dir=base)
+        watermark = detector._watermark_path(SessionReader.get_active_session(base_dir=base))
+        watermark.unlink(missing_ok=True)
+        return detector.detect_new_commits()
+
+    return {
+        "doc_reader_resolve_x100": doc_reader_resolve,
+        "doc_reader_cold": doc_reader_cold,
+        "validate_directory": lambda: validator.validate_directory(directory),
+        "validate_all_sessions": validate_all,
+        "guardrail_inputs": lambda: evaluate_inputs(messages),
+        "guardrail_operations": lambda: evaluate_operations(operations),
+        "sync_detect": lambda: SyncDetector(base_dir=base).detect_agency_updates(),
+        "sync_watermark_cold": sync_watermark_cold,
+        "pre_commit_security": lambda: pre_commit.PreCommitValidator(base, use_cache=False).check_security(),
+        "pre_commit_spec": lambda: pre_commit.PreCommitValidator(base, use_cache=False).check_spec_compliance(),
+    }
+
+
+def run_benchmark(fn: Callable[[], object], repeat: int) -> dict:
+    fn()  # warm-up: imports, page cache, lazily compiled patterns
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "median_s": round(statistics.median(samples), 6),
+        "min_s": round(min(samples), 6),
+        "max_s": round(max(samples), 6),
+        "runs": repeat,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Benchmarks whose median regressed by more than threshold (a fraction)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median_s"):
+            continue
+        ratio = current["median_s"] / previous["median_s"]
+        current["baseline_median_s"] = previous["median_s"]
+        current["ratio"] = round(ratio, 3)
+        if ratio > 1 + threshold:
+            regressions.append({"benchmark": name, "ratio": round(ratio, 3)})
+    return regressions
+
+
+def environment() -> dict:
+    git = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    return {"python": platform.python_version(), "platform": platform.platform(), "git": git}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the IDSE benchmark suite")
+    parser.add_argument("--projects", type=int, default=RepoConfig.projects)
+    parser.add_argument("--sessions", type=int, default=RepoConfig.sessions)
+    parser.add_argument("--artifact-kb", type=int, default=RepoConfig.artifact_kb)
+    parser.add_argument("--history", type=int, default=RepoConfig.history)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Comma-separated benchmark names")
+    parser.add_argument("--output", help="Also write results JSON here (usable as a baseline)")
+    parser.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    config = RepoConfig(
+        projects=args.projects,
+        sessions=args.sessions,
+        artifact_kb=args.artifact_kb,
+        history=args.history,
+    )
+    selected = set(args.only.split(",")) if args.only else None
+
+    with tempfile.TemporaryDirectory(prefix="idse-bench-") as tmp:
+        base = Path(tmp) / "repo"
+        start = time.perf_counter()
+        build(base, config)
+        build_seconds = time.perf_counter() - start
+
+        benchmarks = suite(base)
+        unknown = (selected or set()) - set(benchmarks)
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+        results = {
+            name: run_benchmark(fn, args.repeat)
+            for name, fn in benchmarks.items()
+            if selected is None or name in selected
+        }
+
+    report = {
+        "config": config.to_dict(),
+        "environment": environment(),
+        "build_seconds": round(build_seconds, 3),
+        "results": results,
+    }
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("config") != report["config"]:
+            print("warning: baseline was recorded with a different repo config", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        report["threshold"] = args.threshold
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
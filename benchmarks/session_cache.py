@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Session cache benchmark
+
+Runs `validate_directory` from validate_artifacts.py against a throwaway
+session-enabled tree, with and without the SessionReader cache, and reports
+session-file parses, opens, stats and wall time.
+
+Usage:
+    python benchmarks/session_cache.py [--runs 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from session_reader import SessionReader  # noqa: E402
+
+VALIDATOR = ROOT_DIR / "integrations" / "claude-skill" / "scripts" / "validate_artifacts.py"
+STAGES = [
+    ("intents", "intent.md"),
+    ("contexts", "context.md"),
+    ("specs", "spec.md"),
+    ("plans", "plan.md"),
+    ("tasks", "tasks.md"),
+]
+
+
+def load_validator():
+    spec = importlib.util.spec_from_file_location("validate_artifacts", VALIDATOR)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_tree(base: Path) -> None:
+    session = {"session_id": "bench-1", "project": "Bench", "owner": "bench"}
+    (base / SessionReader.SESSION_FILE).write_text(json.dumps(session))
+    for stage_dir, filename in STAGES:
+        path = base / stage_dir / "projects" / "Bench" / "sessions" / "bench-1" / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {filename}\n\nDone.\n")
+
+
+def run(validator, base: Path, runs: int, cached: bool) -> dict:
+    session_file = str((base / SessionReader.SESSION_FILE).resolve())
+    opens = 0
+
+    def audit(event, args):
+        nonlocal opens
+        if event == "open" and args and str(args[0]) == session_file:
+            opens += 1
+
+    SessionReader.cache.enabled = cached
+    SessionReader.invalidate()
+    SessionReader.cache.reset_stats()
+    sys.addaudithook(audit)  # hooks cannot be removed; counts are diffed below
+
+    start_opens = opens
+    start = time.perf_counter()
+    for _ in range(runs):
+        validator.validate_directory(str(base))
+    elapsed = time.perf_counter() - start
+
+    stats = SessionReader.cache.stats()
+    return {
+        "cached": cached,
+        "runs": runs,
+        "lookups": stats["lookups"],
+        "stat_calls": stats["lookups"],
+        "parses": stats["parses"],
+        "session_file_opens": opens - start_opens,
+        "seconds": round(elapsed, 4),
+        "per_run_ms": round(elapsed * 1000 / runs, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SessionReader cache")
+    parser.add_argument("--runs", type=int, default=200, help="validate_directory runs")
+    args = parser.parse_args()
+
+    validator = load_validator()
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        build_tree(base)
+        uncached = run(validator, base, args.runs, cached=False)
+        cached = run(validator, base, args.runs, cached=True)
+
+    saved = {
+        "parses_saved": uncached["parses"] - cached["parses"],
+        "opens_saved": uncached["session_file_opens"] - cached["session_file_opens"],
+        "speedup": round(uncached["seconds"] / cached["seconds"], 2) if cached["seconds"] else None,
+    }
+    print(json.dumps({"uncached": uncached, "cached": cached, "saved": saved}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
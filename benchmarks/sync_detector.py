@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+SyncDetector benchmark
+
+Builds a throwaway git repo with deep history (via `git fast-import`) and
+compares the two-subprocess flow (`git log -1` + `git show --name-only`)
+with the single-pass, watermark-based `detect_new_commits`.
+
+Usage:
+    python benchmarks/sync_detector.py [--commits 20000] [--runs 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils.sync_detector import SyncDetector  # noqa: E402
+
+SESSION = {"session_id": "bench-1", "project": "Bench"}
+SESSION_SPEC = "specs/projects/Bench/sessions/bench-1/spec.md"
+
+
+def build_repo(base: Path, commits: int, session_every: int) -> None:
+    """Write `commits` commits. In the first half, every `session_every`-th
+    one touches the session spec; the second half never does, so a
+    path-limited `git log -1` has to walk half the history to find it."""
+    subprocess.run(["git", "init", "-q", str(base)], check=True)
+    lines = []
+    for i in range(1, commits + 1):
+        touches_session = i % session_every == 0 and i <= commits // 2
+        path = SESSION_SPEC if touches_session else f"src/module_{i % 50}.py"
+        data = f"revision {i}\n"
+        message = f"change {i}\n"
+        lines.append("commit refs/heads/main")
+        lines.append(f"committer Bench <bench@example.com> {1700000000 + i} +0000")
+        # Successive commits to the same ref in one stream chain automatically.
+        lines.append(f"data {len(message)}\n{message}")
+        lines.append(f"M 100644 inline {path}")
+        lines.append(f"data {len(data)}\n{data}")
+    stream = "\n".join(lines) + "\n"
+    subprocess.run(
+        ["git", "fast-import", "--quiet"], cwd=base, input=stream, text=True, check=True
+    )
+    subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=base, check=True)
+    (base / ".idse_active_session.json").write_text(json.dumps(SESSION))
+
+
+class CountingDetector(SyncDetector):
+    def __init__(self, base_dir):
+        super().__init__(base_dir)
+        self.git_calls = 0
+
+    def _git(self, args):
+        self.git_calls += 1
+        return super()._git(args)
+
+
+def run_two_pass(base: Path, runs: int) -> dict:
+    detector = CountingDetector(base)
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = detector.detect_agency_updates()
+        detector.changed_artifacts(result["commit"], result["session"])
+    elapsed = time.perf_counter() - start
+    return {"git_calls": detector.git_calls, "seconds": round(elapsed, 4)}
+
+
+def run_watermark(base: Path, runs: int) -> dict:
+    detector = CountingDetector(base)
+    start = time.perf_counter()
+    first = detector.detect_new_commits()
+    first_seconds = time.perf_counter() - start
+    repeats = [detector.detect_new_commits() for _ in range(runs - 1)]
+    elapsed = time.perf_counter() - start
+    assert first["has_updates"] and not any(r["has_updates"] for r in repeats)
+    return {
+        "git_calls": detector.git_calls,
+        "seconds": round(elapsed, 4),
+        "first_run_seconds": round(first_seconds, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SyncDetector flows")
+    parser.add_argument("--commits", type=int, default=20000)
+    parser.add_argument("--session-every", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        build_repo(base, args.commits, args.session_every)
+        two_pass = run_two_pass(base, args.runs)
+        watermark = run_watermark(base, args.runs)
+
+    print(
+        json.dumps(
+            {
+                "commits": args.commits,
+                "runs": args.runs,
+                "two_pass": two_pass,
+                "watermark": watermark,
+                "speedup": round(two_pass["seconds"] / watermark["seconds"], 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
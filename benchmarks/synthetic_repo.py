@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Synthetic IDSE repo generator
+
+Builds a throwaway git repo with N projects x M sessions x five stage
+artifacts of a configurable size, plus `--history` commits of git history
+(via `git fast-import`, so deep histories build in seconds). The first
+session is made active; every `--session-every`-th commit in the first half
+of history touches its spec, so sync detection has real walking to do.
+A few edits, one with a fake credential, are left staged for
+PreCommitValidator.
+
+Usage:
+    python benchmarks/synthetic_repo.py /tmp/idse-synth [--projects 5] [--sessions 20]
+        [--artifact-kb 8] [--history 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+STAGES = [
+    ("intent", "intents", "intent.md"),
+    ("context", "contexts", "context.md"),
+    ("spec", "specs", "spec.md"),
+    ("plan", "plans", "plan.md"),
+    ("tasks", "tasks", "tasks.md"),
+]
+FILLER = "Resolved design note: component boundaries agreed, tests listed below.\n"
+MARKER = "- [REQUIRES INPUT] Open question for the Agency\n"
+
+
+@dataclass(frozen=True)
+class RepoConfig:
+    projects: int = 5
+    sessions: int = 20
+    artifact_kb: int = 8
+    history: int = 5000
+    session_every: int = 250
+    staged_files: int = 20
+
+    @property
+    def active(self) -> tuple[str, str]:
+        return project_name(0), session_name(0)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def project_name(index: int) -> str:
+    return f"project-{index:03d}"
+
+
+def session_name(index: int) -> str:
+    return f"session-{index:04d}"
+
+
+def artifact_body(stage: str, size: int, seed: int) -> str:
+    """Roughly `size` bytes: a heading, a few unresolved markers, filler."""
+    head = f"# {stage.title()} {seed}\n\n" + MARKER * (1 + seed % 3)
+    repeats = max(0, (size - len(head)) // len(FILLER))
+    return head + FILLER * repeats
+
+
+def artifact_paths(config: RepoConfig):
+    for p in range(config.projects):
+        for s in range(config.sessions):
+            for stage, stage_dir, filename in STAGES:
+                rel = f"{stage_dir}/projects/{project_name(p)}/sessions/{session_name(s)}/{filename}"
+                yield rel, stage, p * config.sessions + s
+
+
+def _git(base: Path, *args: str, **kwargs) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=base, check=True, **kwargs)
+
+
+def build(base: Path | str, config: RepoConfig = RepoConfig()) -> Path:
+    """Create the synthetic repo at base (which must not exist or be empty)."""
+    base = Path(base)
+    base.mkdir(parents=True, exist_ok=True)
+    _git(base, "init", "-q")
+    _git(base, "config", "user.email", "bench@example.com")
+    _git(base, "config", "user.name", "Bench")
+
+    size = config.artifact_kb * 1024
+    project, session = config.active
+    active_spec = f"specs/projects/{project}/sessions/{session}/spec.md"
+
+    # Commit 1 carries every artifact; later commits are small edits.
+    chunks: list[bytes] = []
+
+    def emit(text: str) -> None:
+        chunks.append(text.encode("utf-8"))
+
+    def emit_data(payload: str) -> None:
+        raw = payload.encode("utf-8")
+        chunks.append(f"data {len(raw)}\n".encode("ascii") + raw + b"\n")
+
+    emit("commit refs/heads/main\n")
+    emit("committer Bench <bench@example.com> 1700000000 +0000\n")
+    emit_data("synthetic artifacts\n")
+    for rel, stage, seed in artifact_paths(config):
+        emit(f"M 100644 inline {rel}\n")
+        emit_data(artifact_body(stage, size, seed))
+
+    for i in range(2, config.history + 1):
+        touches = i % config.session_every == 0 and i <= config.history // 2
+        path = active_spec if touches else f"src/module_{i % 50}.py"
+        body = artifact_body("spec", size, i) if touches else f"revision = {i}\n"
+        emit("commit refs/heads/main\n")
+        emit(f"committer Bench <bench@example.com> {1700000000 + i} +0000\n")
+        emit_data(f"change {i}\n")
+        emit(f"M 100644 inline {path}\n")
+        emit_data(body)
+
+    _git(base, "fast-import", "--quiet", input=b"".join(chunks))
+    _git(base, "symbolic-ref", "HEAD", "refs/heads/main")
+    _git(base, "reset", "--hard", "-q")
+
+    (base / ".idse_active_session.json").write_text(
+        json.dumps({"session_id": session, "project": project, "owner": "bench"})
+    )
+
+    staged = []
+    for index, (rel, _, _) in enumerate(artifact_paths(config)):
+        if index >= config.staged_files:
+            break
+        with open(base / rel, "a") as handle:
+            handle.write("\nEdited during benchmark setup.\n")
+        staged.append(rel)
+    (base / "src").mkdir(exist_ok=True)
+    (base / "src" / "settings.py").write_text('API_KEY = "not-a-real-key"\n')
+    staged.append("src/settings.py")
+    _git(base, "add", "--", *staged)
+    return base
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic IDSE repo")
+    parser.add_argument("directory")
+    parser.add_argument("--projects", type=int, default=RepoConfig.projects)
+    parser.add_argument("--sessions", type=int, default=RepoConfig.sessions)
+    parser.add_argument("--artifact-kb", type=int, default=RepoConfig.artifact_kb)
+    parser.add_argument("--history", type=int, default=RepoConfig.history)
+    parser.add_argument("--session-every", type=int, default=RepoConfig.session_every)
+    args = parser.parse_args()
+
+    config = RepoConfig(
+        projects=args.projects,
+        sessions=args.sessions,
+        artifact_kb=args.artifact_kb,
+        history=args.history,
+        session_every=args.session_every,
+    )
+    build(args.directory, config)
+    print(json.dumps({"directory": args.directory, "config": config.to_dict()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+try:  # Python 3.11+ deprecates the public sre_parse alias
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+
+# Escapes that lowercasing would change: \S -> \s, \W -> \w, and numeric or
+# named escapes for characters (\x41 is "A", which lowered text never holds).
+_UNSAFE_TO_LOWER = re.compile(r"\\[A-Zxu0-9]")
+
+_MISSING = object()
+
+# (pattern id, IGNORECASE pattern, lowercased twin for ASCII text or None)
+_Row = tuple[str, re.Pattern, Optional[re.Pattern]]
+
+
+@dataclass(frozen=True)
+class GuardrailVerdict:
+    """Outcome of one guardrail check on one message."""
+
+    allowed: bool
+    layer: str
+    pattern_id: Optional[str] = None
+    message: str = ""
+
+
+class VerdictCache:
+    """Bounded LRU of scan results keyed by (pattern-set version, content digest).
+
+    Values are the index of the first matching pattern, or None. Keys carry
+    the guardrail's pattern-set version, so entries from an older pattern
+    list are never returned and simply age out.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, bytes], Optional[int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "hit_chars": 0, "miss_chars": 0}
+
+    @staticmethod
+    def key(version: str, text: str) -> tuple[str, bytes]:
+        data = text.encode("utf-8", "surrogatepass")
+        return version, hashlib.blake2b(data, digest_size=16).digest()
+
+    def get(self, key: tuple[str, bytes], size: int = 0):
+        """Cached value for key, or the _MISSING sentinel; size feeds the char counters."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.stats["misses"] += 1
+                self.stats["miss_chars"] += size
+            else:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["hit_chars"] += size
+            return value
+
+    def put(self, key: tuple[str, bytes], value: Optional[int]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats, size=len(self._entries), maxsize=self.maxsize)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+class CompiledGuardrail:
+    """One guardrail layer compiled once into a table of case-insensitive patterns.
+
+    Every pattern is compiled with IGNORECASE, exactly as the per-call
+    `re.search` checks did. IGNORECASE defeats `re`'s literal-prefix scan,
+    so ASCII patterns without case-sensitive escapes also get a lowercased,
+    case-sensitive twin. For pure-ASCII text (`str.isascii()` is O(1)) the
+    two are equivalent and the twin runs against the lowercased text; any
+    other text uses the IGNORECASE pattern, so Unicode case folding (e.g.
+    'ſ' matching 's') is unchanged. Patterns stay separate rather than one
+    `a|b|c` alternation, which measured slower (see
+    benchmarks/guardrail_throughput.py).
+
+    The table is compiled on first use, so importing a layer is free and a
+    process that only checks boundaries never compiles the other layers.
+    The pattern list is kept by reference: editing it recompiles the table
+    and changes `version`, which retires any cached verdicts.
+
+    With a VerdictCache, verdicts are cached per exact text (BLAKE2b of the
+    whole message), which pays off for messages that are checked again
+    verbatim, such as a conversation history re-validated every turn. An
+    edited text is a miss and is scanned in full.
+    """
+
+    def __init__(
+        self,
+        layer: str,
+        patterns: Sequence[str],
+        blocked_message: str,
+        cache: Optional[VerdictCache] = None,
+    ):
+        self.layer = layer
+        self.patterns = patterns
+        self.blocked_message = blocked_message
+        self.cache = cache
+        # (pattern tuple, compiled table, version), swapped as one object.
+        self._state: Optional[tuple[tuple[str, ...], list[_Row], str]] = None
+
+    def _current(self) -> tuple[tuple[str, ...], list[_Row], str]:
+        state = self._state
+        source = tuple(self.patterns)
+        if state is None or state[0] != source:
+            table = []
+            for index, pattern in enumerate(source):
+                folded = None
+                if pattern.isascii() and not _UNSAFE_TO_LOWER.search(pattern):
+                    folded = re.compile(pattern.lower())
+                table.append((self.pattern_id(index), re.compile(pattern, re.IGNORECASE), folded))
+            digest = hashlib.blake2b("\0".join((self.layer,) + source).encode(), digest_size=8)
+            state = self._state = (source, table, digest.hexdigest())
+        return state
+
+    @property
+    def version(self) -> str:
+        """Digest of the layer name and pattern list; changes whenever the patterns do."""
+        return self._current()[2]
+
+    def pattern_id(self, index: int) -> str:
+        return f"{self.layer}:{index}"
+
+    def max_match_width(self, cap: int) -> int:
+        """Longest possible match across the layer, clipped to cap.
+
+        Unbounded repeats (`.*`, `\\s+`) make the true width infinite, so
+        cap bounds how far back a streaming scan has to look.
+        """
+        widest = 1
+        for pattern in self.patterns:
+            _, high = sre_parse.parse(pattern).getwidth()
+            widest = max(widest, min(high, cap))
+        return widest
+
+    @staticmethod
+    def _first_match(table: list[_Row], text: str) -> Optional[int]:
+        if not text.isascii():
+            for index, (_, compiled, _) in enumerate(table):
+                if compiled.search(text):
+                    return index
+            return None
+        lowered = text.lower()
+        for index, (_, compiled, folded) in enumerate(table):
+            if folded.search(lowered) if folded is not None else compiled.search(text):
+                return index
+        return None
+
+    def _cached_match(self, table, version: str, text: str) -> Optional[int]:
+        key = self.cache.key(version, text)
+        index = self.cache.get(key, len(text))
+        if index is _MISSING:
+            index = self._first_match(table, text)
+            self.cache.put(key, index)
+        return index
+
+    def search(self, text: str, cached: bool = True) -> Optional[str]:
+        """Return the id of the first matching pattern (list order), or None."""
+        _, table, version = self._current()
+        if self.cache is None or not cached:
+            index = self._first_match(table, text)
+        else:
+            index = self._cached_match(table, version, text)
+        return None if index is None else self.pattern_id(index)
+
+    def evaluate(self, text: str, cached: bool = True) -> GuardrailVerdict:
+        pattern_id = self.search(text, cached)
+        if pattern_id is None:
+            return GuardrailVerdict(True, self.layer)
+        return GuardrailVerdict(False, self.layer, pattern_id, self.blocked_message)
+
+    def evaluate_batch(self, messages: Iterable[str]) -> list[GuardrailVerdict]:
+        evaluate = self.evaluate
+        return [evaluate(text) for text in messages]
+
+
+class StreamingScanner:
+    """Incremental scan of a response that arrives in chunks.
+
+    Only the last `window - 1` characters are retained between chunks, where
+    window is the layer's longest match width (clipped to max_window). Any
+    match no longer than the window is caught on the chunk that completes it,
+    including matches that straddle chunk boundaries. Once a chunk is
+    blocked the verdict is sticky; callers must stop forwarding output.
+    """
+
+    def __init__(self, guardrail: CompiledGuardrail, max_window: int = 1024):
+        self.guardrail = guardrail
+        self.window = guardrail.max_match_width(cap=max_window)
+        self.chars_seen = 0
+        self.verdict = GuardrailVerdict(True, guardrail.layer)
+        self._tail = ""
+
+    def feed(self, chunk: str) -> GuardrailVerdict:
+        if not self.verdict.allowed:
+            return self.verdict
+        self.chars_seen += len(chunk)
+        text = self._tail + chunk
+        # Tail+chunk windows rarely repeat; keep them out of the verdict cache.
+        self.verdict = self.guardrail.evaluate(text, cached=False)
+        keep = self.window - 1
+        self._tail = text[-keep:] if keep > 0 and self.verdict.allowed else ""
+        return self.verdict
+
+    @property
+    def blocked(self) -> bool:
+        return not self.verdict.allowed
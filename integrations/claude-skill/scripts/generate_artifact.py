@@ -250,15 +250,38 @@ CREATE INDEX idx_example ON example(column);
 '''
 }
 
+
+class ArtifactTemplate:
+    """A stage template split once around its {timestamp} placeholder.
+
+    Rendering is a single join. Unlike str.format, literal braces in the
+    template (the JSON examples in plan.md) are left alone.
+    """
+
+    PLACEHOLDER = "{timestamp}"
+
+    def __init__(self, stage: str, text: str):
+        self.stage = stage
+        self._parts = text.split(self.PLACEHOLDER)
+
+    def render(self, timestamp: str) -> str:
+        return timestamp.join(self._parts)
+
+
+COMPILED_TEMPLATES = {stage: ArtifactTemplate(stage, text) for stage, text in TEMPLATES.items()}
+
+
+def default_timestamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M")
+
+
 def generate_artifact(stage: str, output_path: str = None) -> str:
     """Generate an IDSE artifact template."""
     if stage not in TEMPLATES:
         valid = ", ".join(TEMPLATES.keys())
         raise ValueError(f"Unknown stage: {stage}. Valid stages: {valid}")
     
-    content = TEMPLATES[stage].format(
-        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M")
-    )
+    content = COMPILED_TEMPLATES[stage].render(default_timestamp())
     
     if output_path:
         path = Path(output_path)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+IDSE Bulk Session Scaffolder
+
+Creates stage templates for many sessions in one process, e.g. to load-test
+the Agency pipeline. Each template is rendered once per run and the same
+bytes are written to every session; directories are created leaf-first and
+files are written with a single open/write/close each.
+
+Manifest: JSON lines of {"project": ..., "session": ..., "stages": [...]}.
+"stages" defaults to all five stages.
+
+Usage:
+    python scaffold_sessions.py manifest.jsonl [--base-dir .] [--overwrite]
+    python scaffold_sessions.py --synthetic 10000 --projects 20 --base-dir /tmp/load
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from session_reader import ActiveSession  # noqa: E402
+from generate_artifact import COMPILED_TEMPLATES, default_timestamp  # noqa: E402
+from validate_artifacts import STAGE_FILES, STAGE_ORDER  # noqa: E402
+
+
+@dataclass(frozen=True)
+class ScaffoldEntry:
+    project: str
+    session_id: str
+    stages: tuple[str, ...] = tuple(STAGE_ORDER)
+
+    @classmethod
+    def from_mapping(cls, data: dict) -> "ScaffoldEntry":
+        session = ActiveSession.from_mapping(
+            {"project": data.get("project"), "session_id": data.get("session", data.get("session_id"))}
+        )
+        stages = tuple(data.get("stages") or STAGE_ORDER)
+        unknown = [stage for stage in stages if stage not in STAGE_FILES]
+        if unknown:
+            raise ValueError(f"Unknown stages {unknown}; valid: {', '.join(STAGE_ORDER)}")
+        return cls(session.project, session.session_id, stages)
+
+
+def read_manifest(lines: Iterable[str]) -> Iterator[ScaffoldEntry]:
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield ScaffoldEntry.from_mapping(json.loads(line))
+        except ValueError as exc:
+            raise ValueError(f"manifest line {number}: {exc}") from exc
+
+
+def synthetic_manifest(sessions: int, projects: int = 1) -> Iterator[ScaffoldEntry]:
+    for index in range(sessions):
+        yield ScaffoldEntry(f"load-{index % max(1, projects):04d}", f"session-{index:06d}")
+
+
+class SessionScaffolder:
+    """Writes pre-rendered stage templates into session directories."""
+
+    def __init__(
+        self,
+        base_dir: Path | str = Path("."),
+        timestamp: Optional[str] = None,
+        overwrite: bool = False,
+    ):
+        self.base_dir = Path(base_dir)
+        self.timestamp = timestamp or default_timestamp()
+        self.overwrite = overwrite
+        self._rendered = {
+            stage: template.render(self.timestamp).encode("utf-8")
+            for stage, template in COMPILED_TEMPLATES.items()
+        }
+        self._flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if overwrite else os.O_EXCL)
+        self._known_dirs: set[str] = set()
+        self.stats = {"sessions": 0, "files_written": 0, "files_skipped": 0, "dirs_created": 0}
+
+    def _ensure_dir(self, path: str) -> None:
+        if path in self._known_dirs:
+            return
+        try:
+            os.mkdir(path)  # common case: parent already exists -> one syscall
+            self.stats["dirs_created"] += 1
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            os.makedirs(path, exist_ok=True)
+            self.stats["dirs_created"] += 1
+        self._known_dirs.add(path)
+
+    def _write(self, path: str, data: bytes) -> bool:
+        try:
+            fd = os.open(path, self._flags, 0o644)
+        except FileExistsError:
+            return False
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        return True
+
+    def scaffold(self, entries: Iterable[ScaffoldEntry]) -> dict:
+        """Create the listed stage files for every entry; returns stats with sessions/sec."""
+        base = os.fspath(self.base_dir)
+        started = time.perf_counter()
+        for entry in entries:
+            for stage in entry.stages:
+                stage_dir, filename = STAGE_FILES[stage]
+                directory = os.path.join(
+                    base, stage_dir, "projects", entry.project, "sessions", entry.session_id
+                )
+                self._ensure_dir(directory)
+                if self._write(os.path.join(directory, filename), self._rendered[stage]):
+                    self.stats["files_written"] += 1
+                else:
+                    self.stats["files_skipped"] += 1
+            self.stats["sessions"] += 1
+
+        elapsed = time.perf_counter() - started
+        return {
+            **self.stats,
+            "elapsed_s": round(elapsed, 3),
+            "sessions_per_sec": round(self.stats["sessions"] / elapsed, 1) if elapsed else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaffold IDSE stage templates for many sessions")
+    parser.add_argument("manifest", nargs="?", help="JSONL manifest path, or '-' for stdin")
+    parser.add_argument("--base-dir", default=".", help="Project root to scaffold into")
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing artifacts")
+    parser.add_argument("--synthetic", type=int, help="Generate N sessions instead of a manifest")
+    parser.add_argument("--projects", type=int, default=1, help="Projects to spread --synthetic over")
+    args = parser.parse_args()
+
+    if args.synthetic is None and not args.manifest:
+        parser.error("provide a manifest or --synthetic N")
+
+    scaffolder = SessionScaffolder(args.base_dir, overwrite=args.overwrite)
+    try:
+        if args.synthetic is not None:
+            stats = scaffolder.scaffold(synthetic_manifest(args.synthetic, args.projects))
+        elif args.manifest == "-":
+            stats = scaffolder.scaffold(read_manifest(sys.stdin))
+        else:
+            with open(args.manifest) as handle:
+                stats = scaffolder.scaffold(read_manifest(handle))
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
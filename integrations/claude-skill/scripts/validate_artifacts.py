@@ -8,26 +8,35 @@ with support for Agency session paths and simple fallbacks.
 Usage:
     python validate_artifacts.py <directory>
     python validate_artifacts.py ./project/
+    python validate_artifacts.py . --all-sessions   # JSON Lines, one per session
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import re
+import os
 import sys
+from collections import Counter
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 
 ROOT_DIR = Path(__file__).resolve().parents[3]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from session_reader import SessionReader  # noqa: E402
+from utils.artifact_index import ArtifactIndex  # noqa: E402
 from utils.doc_reader import IDSEDocReader  # noqa: E402
+from utils.marker_scanner import scan_markers  # noqa: E402
 from guardrails.instruction_protection import (  # noqa: E402
     idse_boundary_guardrail,
 )
-from utils.template_writer import TemplateWriter  # noqa: E402
+
+if TYPE_CHECKING:
+    from utils.result_cache import ValidationCache
+
+# sqlite3 (ValidationCache) and the process pool load only when used.
 
 STAGE_ORDER = ["intent", "context", "spec", "plan", "tasks"]
 STAGE_DEPENDENCIES = {
@@ -55,32 +64,47 @@ def find_requires_input(content: str) -> list[tuple[int, str]]:
     return results
 
 
-def validate_artifact(path: Path) -> dict:
+def validate_artifact(path: Path, cache: ValidationCache | None = None) -> dict:
     """Validate a single artifact file."""
     is_safe, message = idse_boundary_guardrail(str(path), "read")
     if not is_safe:
         raise PermissionError(message)
 
-    content = path.read_text()
     stage = path.stem.lower()
-    is_draft = TemplateWriter.is_draft(content)
-
-    issues = find_requires_input(content)
+    if cache is not None:
+        scan = cache.scan(path)
+    else:
+        # One mmap pass finds both markers; see utils/marker_scanner.py.
+        found = scan_markers(path)
+        scan = {
+            "unresolved_count": found.unresolved_count,
+            "issues": found.issues,
+            "draft": found.draft,
+        }
 
     return {
         "path": str(path),
         "stage": stage,
-        "valid": True if is_draft else len(issues) == 0,
-        "unresolved_count": len(issues),
-        "issues": issues,
-        "draft": is_draft,
+        "valid": True if scan["draft"] else scan["unresolved_count"] == 0,
+        "unresolved_count": scan["unresolved_count"],
+        "issues": scan["issues"],
+        "draft": scan["draft"],
     }
 
 
-def validate_directory(directory: str) -> dict:
-    """Validate all IDSE artifacts in a directory (session-aware)."""
+def validate_directory(
+    directory: str,
+    index: ArtifactIndex | None = None,
+    cache: ValidationCache | None = None,
+) -> dict:
+    """Validate all IDSE artifacts in a directory (session-aware).
+
+    Pass a pre-built ArtifactIndex to resolve artifacts from its directory
+    listings instead of probing each fallback path with stat(), and a
+    ValidationCache to reuse results for artifacts whose content is unchanged.
+    """
     dir_path = Path(directory)
-    reader = IDSEDocReader(base_dir=dir_path)
+    reader = IDSEDocReader(base_dir=dir_path, index=index)
 
     results = {
         "directory": directory,
@@ -99,12 +123,19 @@ def validate_directory(directory: str) -> dict:
         if not artifact_path:
             continue
 
-        validation = validate_artifact(artifact_path)
+        validation = validate_artifact(artifact_path, cache=cache)
         results["artifacts"].append(validation)
         results["total_unresolved"] += validation["unresolved_count"]
         found_stages[stage] = validation["valid"]
 
-    # Determine which stage is ready
+    results["ready_for_next_stage"] = next_stage(found_stages)
+    if cache is not None:
+        results["cache"] = dict(cache.stats)
+    return results
+
+
+def next_stage(found_stages: dict) -> str:
+    """Return the stage that is ready to be worked on, given {stage: valid}."""
     current_stage = None
     for stage in STAGE_ORDER:
         if stage in found_stages:
@@ -118,15 +149,131 @@ def validate_directory(directory: str) -> dict:
     if current_stage:
         idx = STAGE_ORDER.index(current_stage)
         if idx < len(STAGE_ORDER) - 1:
-            results["ready_for_next_stage"] = STAGE_ORDER[idx + 1]
-        else:
-            results["ready_for_next_stage"] = "implementation"
-    else:
-        results["ready_for_next_stage"] = "intent"
+            return STAGE_ORDER[idx + 1]
+        return "implementation"
+    return "intent"
+
+
+_WORKER_CACHE: ValidationCache | None = None
+
+
+def _worker_cache(directory: str) -> ValidationCache | None:
+    """One cache connection per worker process, opened on first use."""
+    global _WORKER_CACHE
+    if _WORKER_CACHE is None:
+        from utils.result_cache import ValidationCache
+
+        _WORKER_CACHE = ValidationCache.open(directory)
+    return _WORKER_CACHE
+
+
+def validate_session(
+    directory: str,
+    project: str,
+    session_id: str,
+    stages: list[str],
+    use_cache: bool = False,
+) -> dict:
+    """Validate one session's artifacts at their session-scoped paths only.
+
+    stages lists the stages whose artifact exists (as found by the caller's
+    ArtifactIndex), so no fallback paths are probed.
+    """
+    cache = _worker_cache(directory) if use_cache else None
+    before = dict(cache.stats) if cache else {}
+    results = {
+        "directory": directory,
+        "project": project,
+        "session_id": session_id,
+        "artifacts": [],
+        "ready_for_next_stage": None,
+        "total_unresolved": 0,
+    }
+    found_stages = {}
+    for stage in STAGE_ORDER:
+        if stage not in stages:
+            continue
+        stage_dir, filename = STAGE_FILES[stage]
+        path = Path(directory) / stage_dir / "projects" / project / "sessions" / session_id / filename
+        validation = validate_artifact(path, cache=cache)
+        results["artifacts"].append(validation)
+        results["total_unresolved"] += validation["unresolved_count"]
+        found_stages[stage] = validation["valid"]
 
+    results["ready_for_next_stage"] = next_stage(found_stages)
+    if cache is not None:
+        results["cache"] = {key: cache.stats[key] - before[key] for key in cache.stats}
     return results
 
 
+def validate_all_sessions(
+    directory: str,
+    workers: int | None = None,
+    use_cache: bool = False,
+) -> Iterator[dict]:
+    """Discover every projects/<p>/sessions/<s> and validate them in a process pool.
+
+    Results are yielded as each session finishes, not in discovery order.
+    """
+    index = ArtifactIndex(directory)
+    jobs = []
+    for project, session_id in sorted(index.sessions()):
+        stages = [
+            stage
+            for stage in STAGE_ORDER
+            if index.contains(*STAGE_FILES[stage], project=project, session_id=session_id)
+        ]
+        jobs.append((directory, project, session_id, stages, use_cache))
+
+    if not jobs:
+        return
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(jobs))) as pool:
+        futures = {pool.submit(validate_session, *job): job for job in jobs}
+        for future in as_completed(futures):
+            _, project, session_id, _, _ = futures[future]
+            try:
+                yield future.result()
+            except Exception as exc:
+                yield {
+                    "directory": directory,
+                    "project": project,
+                    "session_id": session_id,
+                    "error": f"{type(exc).__name__}: {exc}",
+                }
+
+
+def stream_all_sessions(
+    directory: str,
+    workers: int | None = None,
+    use_cache: bool = False,
+) -> dict:
+    """Print one JSON line per session as it completes, then a summary line."""
+    by_stage = Counter()
+    cache_stats = Counter()
+    summary = {"sessions": 0, "errors": 0, "total_unresolved": 0}
+    for result in validate_all_sessions(directory, workers=workers, use_cache=use_cache):
+        print(json.dumps(result), flush=True)
+        summary["sessions"] += 1
+        if "error" in result:
+            summary["errors"] += 1
+            continue
+        summary["total_unresolved"] += result["total_unresolved"]
+        by_stage[result["ready_for_next_stage"]] += 1
+        cache_stats.update(result.get("cache", {}))
+
+    summary["ready_for_next_stage"] = {
+        stage: by_stage[stage]
+        for stage in [*STAGE_ORDER, "implementation"]
+        if by_stage[stage]
+    }
+    if use_cache:
+        summary["cache"] = {"hits": cache_stats["hits"], "misses": cache_stats["misses"]}
+    print(json.dumps({"summary": summary}), flush=True)
+    return summary
+
+
 def print_report(results: dict):
     """Print validation report."""
     print(f"\n📋 IDSE Artifact Validation: {results['directory']}")
@@ -187,10 +334,43 @@ def main():
         action="store_true",
         help="Output as JSON",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-validate everything instead of reusing .idse_cache/validation.sqlite3",
+    )
+    parser.add_argument(
+        "--all-sessions",
+        action="store_true",
+        help="Validate every projects/<p>/sessions/<s> in parallel; emits JSON Lines",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for --all-sessions (default: CPU count)",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Resolve artifacts from one directory walk instead of per-path stat() probes",
+    )
 
     args = parser.parse_args()
 
-    results = validate_directory(args.directory)
+    if args.all_sessions:
+        summary = stream_all_sessions(
+            args.directory, workers=args.workers, use_cache=not args.no_cache
+        )
+        failed = summary["total_unresolved"] or summary["errors"]
+        sys.exit(1 if failed else 0)
+
+    index = ArtifactIndex(args.directory) if args.index else None
+    cache = None
+    if not args.no_cache:
+        from utils.result_cache import ValidationCache
+
+        cache = ValidationCache.open(args.directory)
+    results = validate_directory(args.directory, index=index, cache=cache)
 
     if args.json:
         print(json.dumps(results, indent=2))
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+IDSE Artifact Watcher
+
+Stays resident, re-validates only the artifacts whose files changed and
+re-checks Agency sync when git refs move. The latest state is published to
+`.idse_cache/status.json` (atomically replaced), which
+`integrations/ide/tasks/governance.py status` reads without rescanning.
+
+Uses inotify on Linux and falls back to polling elsewhere (or with --poll).
+
+Usage:
+    python watch_artifacts.py [directory] [--interval 2] [--poll] [--once]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from session_reader import SessionReader  # noqa: E402
+from utils.doc_reader import IDSEDocReader  # noqa: E402
+from utils.result_cache import ValidationCache  # noqa: E402
+from utils.sync_detector import SyncDetector  # noqa: E402
+from validate_artifacts import (  # noqa: E402
+    STAGE_FILES,
+    STAGE_ORDER,
+    next_stage,
+    validate_artifact,
+)
+
+STATUS_FILE = Path(".idse_cache") / "status.json"
+
+# inotify(7) event mask: anything that can change what an artifact path resolves to.
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+
+class PollingWatcher:
+    """Fallback: wake up every interval and let the stat checks decide."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def watch(self, paths: list[Path]) -> None:
+        pass
+
+    def wait(self) -> None:
+        time.sleep(self.interval)
+
+
+class InotifyWatcher:
+    """Blocks until something changes in a watched directory (or interval passes).
+
+    Events are only a wake-up signal; the stat-signature checks in
+    ArtifactWatcher decide what actually needs re-validation.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name or not sys.platform.startswith("linux"):
+            raise OSError("inotify unavailable")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watched: set[str] = set()
+
+    def watch(self, paths: list[Path]) -> None:
+        for path in paths:
+            # Missing directories are covered by watching their nearest existing parent.
+            while not path.is_dir() and path != path.parent:
+                path = path.parent
+            key = os.fsencode(str(path))
+            if key in self._watched:
+                continue
+            if self._libc.inotify_add_watch(self._fd, key, WATCH_MASK) >= 0:
+                self._watched.add(key)
+
+    def wait(self) -> None:
+        ready, _, _ = select.select([self._fd], [], [], self.interval)
+        if ready:
+            time.sleep(0.05)  # let a burst of writes settle into one pass
+            try:
+                while os.read(self._fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+            # Watch descriptors for deleted/moved dirs are gone; re-add next round.
+            self._watched.clear()
+
+
+def _signature(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def write_status(path: Path, status: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(status, indent=2))
+    os.replace(tmp, path)
+
+
+class ArtifactWatcher:
+    """Incremental validation + sync state for one working directory."""
+
+    def __init__(self, base_dir: Path | str = Path("."), use_cache: bool = True):
+        self.base_dir = Path(base_dir)
+        self.reader = IDSEDocReader(base_dir=self.base_dir)
+        self.detector = SyncDetector(base_dir=self.base_dir)
+        self.cache = ValidationCache.open(self.base_dir) if use_cache else None
+        self.git_dir = self._find_git_dir()
+        self._artifacts: dict[str, tuple[Path, tuple, dict]] = {}
+        self._session_sig = None
+        self._refs_sig = None
+        self.sync: dict = {}
+        self.validations = 0
+
+    def _find_git_dir(self) -> Optional[Path]:
+        dot_git = self.base_dir / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():  # worktrees and submodules: "gitdir: <path>"
+            target = dot_git.read_text().partition("gitdir:")[2].strip()
+            if target:
+                return (self.base_dir / target).resolve()
+        return None
+
+    def watch_paths(self) -> list[Path]:
+        paths = [self.base_dir]
+        session = SessionReader.get_session(base_dir=self.base_dir)
+        for stage in STAGE_ORDER:
+            stage_dir, _ = STAGE_FILES[stage]
+            paths += [self.base_dir / stage_dir, self.base_dir / stage_dir / "current"]
+            if session:
+                paths.append(
+                    self.base_dir / stage_dir / "projects" / session.project
+                    / "sessions" / session.session_id
+                )
+        if self.git_dir:
+            paths += [self.git_dir, self.git_dir / "refs" / "heads"]
+        return paths
+
+    def _refs_signature(self) -> tuple:
+        if not self.git_dir:
+            return ()
+        head = self.git_dir / "HEAD"
+        sig = [
+            _signature(head),
+            _signature(self.git_dir / "packed-refs"),
+            _signature(self.git_dir / "refs" / "heads"),
+        ]
+        try:
+            ref = head.read_text().partition("ref:")[2].strip()
+        except OSError:
+            ref = ""
+        if ref:
+            sig.append(_signature(self.git_dir / ref))
+        return tuple(sig)
+
+    def check(self) -> bool:
+        """Re-validate changed artifacts and re-check sync; True if anything changed."""
+        changed = False
+        session_sig = _signature(self.base_dir / SessionReader.SESSION_FILE)
+        if session_sig != self._session_sig:
+            self._session_sig = session_sig
+            self._refs_sig = None  # session paths changed; re-run sync detection
+            changed = True
+
+        for stage in STAGE_ORDER:
+            stage_dir, filename = STAGE_FILES[stage]
+            path = self.reader.resolve(stage_dir, filename)
+            previous = self._artifacts.get(stage)
+            if path is None:
+                if previous is not None:
+                    del self._artifacts[stage]
+                    changed = True
+                continue
+            sig = _signature(path)
+            if previous and previous[0] == path and previous[1] == sig:
+                continue
+            try:
+                validation = validate_artifact(path, cache=self.cache)
+            except (OSError, PermissionError) as exc:
+                validation = {"path": str(path), "stage": stage, "error": str(exc)}
+            self.validations += 1
+            self._artifacts[stage] = (path, sig, validation)
+            changed = True
+
+        refs_sig = self._refs_signature()
+        if refs_sig != self._refs_sig:
+            self._refs_sig = refs_sig
+            result = self.detector.detect_agency_updates()
+            result.pop("session", None)
+            self.sync = result
+            changed = True
+
+        return changed
+
+    def status(self) -> dict:
+        artifacts = [self._artifacts[s][2] for s in STAGE_ORDER if s in self._artifacts]
+        found = {a["stage"]: a.get("valid", False) for a in artifacts}
+        return {
+            "updated_at": time.time(),
+            "pid": os.getpid(),
+            "directory": str(self.base_dir),
+            "session": SessionReader.get_active_session(base_dir=self.base_dir),
+            "artifacts": artifacts,
+            "ready_for_next_stage": next_stage(found),
+            "total_unresolved": sum(a.get("unresolved_count", 0) for a in artifacts),
+            "sync": self.sync,
+            "validations": self.validations,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch IDSE artifacts and publish status")
+    parser.add_argument("directory", nargs="?", default=".", help="Project root")
+    parser.add_argument("--interval", type=float, default=2.0, help="Poll / safety interval (s)")
+    parser.add_argument("--poll", action="store_true", help="Force polling instead of inotify")
+    parser.add_argument("--once", action="store_true", help="Publish one status and exit")
+    parser.add_argument("--no-cache", action="store_true", help="Skip the validation cache")
+    args = parser.parse_args()
+
+    watcher = ArtifactWatcher(args.directory, use_cache=not args.no_cache)
+    status_path = Path(args.directory) / STATUS_FILE
+    notifier = PollingWatcher(args.interval)
+    if not args.poll:
+        try:
+            notifier = InotifyWatcher(args.interval)
+        except OSError:
+            pass
+
+    print(f"Watching {args.directory} ({type(notifier).__name__}); status: {status_path}")
+    try:
+        while True:
+            if watcher.check():
+                write_status(status_path, watcher.status())
+            if args.once:
+                return
+            notifier.watch(watcher.watch_paths())
+            notifier.wait()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
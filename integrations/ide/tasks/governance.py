@@ -1,49 +1,76 @@
 #!/usr/bin/env python3
-import json, sys, os, time, tempfile
+import json, sys, time
+from pathlib import Path
 
-STATE_PATH = "idse-governance/state/state.json"
+ROOT_DIR = Path(__file__).resolve().parents[3]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
 
-def load_state():
-    with open(STATE_PATH) as f:
-        return json.load(f)
+from utils.governance_state import GovernanceStateStore
+from utils.sync_detector import SyncDetector, report_new_commits
 
-def save_state(data):
-    tmp = tempfile.NamedTemporaryFile("w", delete=False)
-    json.dump(data, tmp, indent=2)
-    tmp.close()
-    os.replace(tmp.name, STATE_PATH)
+WATCH_STATUS_PATH = ".idse_cache/status.json"  # published by watch_artifacts.py
 
 def view():
-    print(json.dumps(load_state(), indent=2))
+    print(json.dumps(GovernanceStateStore().current(), indent=2))
 
 def handoff(frm, to, reason):
-    state = load_state()
-    state.update({
-        "active_llm": to,
-        "awaiting_handoff": True,
-        "handoff_cycle_id": time.strftime("%Y-%m-%dT%H:%MZ"),
-        "last_handoff": {
-            "from": frm,
-            "to": to,
-            "timestamp": time.strftime("%Y-%m-%dT%H:%MZ"),
-            "reason": reason
-        }
-    })
-    save_state(state)
+    GovernanceStateStore().handoff(frm, to, reason)
     print(f"Handoff recorded: {frm} → {to}")
 
 def role(role_name):
-    state = load_state()
-    state["role_change_event"] = {
-        "role": role_name,
-        "timestamp": time.strftime("%Y-%m-%dT%H:%MZ")
-    }
-    save_state(state)
+    GovernanceStateStore().role(role_name)
     print(f"Role changed → {role_name}")
 
+def history(since=None):
+    for event in GovernanceStateStore().history(since=since):
+        data = event["data"]
+        print(f"{event['timestamp']}  {data['from']} → {data['to']}  {data.get('reason', '')}")
+
+def compact():
+    position = GovernanceStateStore().compact()
+    print(f"Compacted state.json through event {position['seq']}")
+
+def sync(show_changes=False, since_last=False):
+    detector = SyncDetector()
+    if since_last:
+        report_new_commits(detector.detect_new_commits(), show_changes)
+        return
+    result = detector.detect_agency_updates()
+    if not result.get("has_updates"):
+        print(f"No Agency updates ({result.get('reason', 'none')})")
+        return
+    print(f"Agency: {result['commit']} by {result['author']} ({result['time_ago']}): {result['message']}")
+    if show_changes:
+        for path in detector.changed_artifacts(result["commit"], result["session"]):
+            print(f"  - {path}")
+
+def status():
+    try:
+        with open(WATCH_STATUS_PATH) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        print("No watch status; run integrations/claude-skill/scripts/watch_artifacts.py")
+        sys.exit(1)
+    age = time.time() - data.get("updated_at", 0)
+    session = data.get("session") or {}
+    print(f"Session: {session.get('project')}/{session.get('session_id')} (updated {age:.0f}s ago)")
+    for artifact in data.get("artifacts", []):
+        if "error" in artifact:
+            print(f"  ! {artifact['stage']}: {artifact['error']}")
+        else:
+            mark = "✓" if artifact.get("valid") else "✗"
+            print(f"  {mark} {artifact['stage']}: {artifact['unresolved_count']} unresolved ({artifact['path']})")
+    print(f"Ready for: {data.get('ready_for_next_stage')}")
+    sync = data.get("sync") or {}
+    if sync.get("has_updates"):
+        print(f"Agency: {sync['commit']} by {sync['author']} ({sync['time_ago']}): {sync['message']}")
+    else:
+        print(f"Agency: no updates ({sync.get('reason', 'unknown')})")
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: governance.py [view|handoff|role]")
+        print("Usage: governance.py [view|handoff|role|history [since]|compact|status|sync [--since-last] [--show-changes]]")
         sys.exit(1)
     cmd = sys.argv[1]
     if cmd == "view":
@@ -53,3 +80,11 @@ if __name__ == "__main__":
         handoff(frm, to, " ".join(reason))
     elif cmd == "role":
         role(sys.argv[2])
+    elif cmd == "history":
+        history(sys.argv[2] if len(sys.argv) > 2 else None)
+    elif cmd == "compact":
+        compact()
+    elif cmd == "status":
+        status()
+    elif cmd == "sync":
+        sync(show_changes="--show-changes" in sys.argv, since_last="--since-last" in sys.argv)
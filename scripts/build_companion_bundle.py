@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import argparse
+import hashlib
+import io
+import json
+import os
 import shutil
+import subprocess
+import sys
+import tarfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
 ROOT = Path(__file__).resolve().parents[1]
 BUNDLE_DIR = ROOT / "companion_bundle"
+MANIFEST_NAME = ".bundle-manifest.json"
 
 INCLUDE_PATHS = [
     "AGENTS.md",
@@ -15,8 +28,16 @@ INCLUDE_PATHS = [
     "utils/sync_detector.py",
     "utils/template_writer.py",
     "utils/feedback_writer.py",
+    "utils/feedback_index.py",
+    "utils/artifact_index.py",
+    "utils/artifact_writer.py",
+    "utils/governance_state.py",
+    "utils/marker_scanner.py",
+    "utils/metrics.py",
+    "utils/result_cache.py",
     "guardrails/",
     "integrations/claude-skill/scripts/validate_artifacts.py",
+    "integrations/claude-skill/scripts/watch_artifacts.py",
     ".cursor/rules/",
     ".cursor/tasks/governance.py",
     ".github/workflows/agency-dispatch-validate.yml",
@@ -29,30 +50,286 @@ INCLUDE_PATHS = [
     "docs/sync-protocol.md",
 ]
 
+# Bundled .py files under these roots (or at the top level) are imported as
+# modules by the smoke check; any other script is loaded from its path.
+PACKAGE_ROOTS = ("utils", "guardrails")
+
+_SMOKE = """
+import importlib, importlib.util, json, sys
+root, names = sys.argv[1], sys.argv[2:]
+sys.path.insert(0, root)
+failed = []
+for index, rel in enumerate(names):
+    try:
+        top = rel.split("/", 1)[0]
+        if "/" not in rel or top in {packages!r}:
+            importlib.import_module(rel[:-3].replace("/", "."))
+        else:
+            spec = importlib.util.spec_from_file_location(f"_bundle_smoke_{{index}}", f"{{root}}/{{rel}}")
+            spec.loader.exec_module(importlib.util.module_from_spec(spec))
+    except ModuleNotFoundError as exc:
+        failed.append((rel, exc.name, str(exc)))
+    except Exception as exc:
+        failed.append((rel, None, f"{{type(exc).__name__}}: {{exc}}"))
+print(json.dumps(failed))
+""".format(packages=PACKAGE_ROOTS)
+
+# Bytecode caches are machine-specific and would make archives irreproducible.
+EXCLUDED_DIRS = {"__pycache__"}
+EXCLUDED_SUFFIXES = (".pyc", ".pyo")
+
+# Archive members get a fixed timestamp (SOURCE_DATE_EPOCH if set; zip
+# cannot represent anything before 1980-01-01).
+DEFAULT_EPOCH = 315532800
+GZIP_CHUNK = 1 << 20
+
+
+def iter_sources(missing: list[str]) -> dict[str, Path]:
+    """Map bundle-relative paths to source files for everything in INCLUDE_PATHS."""
+    files: dict[str, Path] = {}
+    for rel in INCLUDE_PATHS:
+        src = ROOT / rel
+        if not src.exists():
+            missing.append(rel)
+            continue
+        if src.is_file():
+            files[Path(rel).as_posix()] = src
+            continue
+        for dirpath, dirnames, filenames in os.walk(src):
+            dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+            for name in filenames:
+                if name.endswith(EXCLUDED_SUFFIXES):
+                    continue
+                path = Path(dirpath) / name
+                files[path.relative_to(ROOT).as_posix()] = path
+    return dict(sorted(files.items()))
+
+
+def file_digest(path: Path) -> str:
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def load_manifest(bundle_dir: Path) -> dict:
+    try:
+        return json.loads((bundle_dir / MANIFEST_NAME).read_text())["files"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_manifest(bundle_dir: Path, files: dict) -> None:
+    path = bundle_dir / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": 1, "files": files}, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def sync_bundle(bundle_dir: Path = BUNDLE_DIR) -> dict:
+    """Bring bundle_dir in line with INCLUDE_PATHS, copying only changed files.
+
+    A source whose size and mtime match the manifest is skipped without
+    reading it; otherwise its hash decides whether the copy is stale.
+    Files dropped from INCLUDE_PATHS (or deleted upstream) are removed.
+    """
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest(bundle_dir)
+    missing: list[str] = []
+    sources = iter_sources(missing)
+    stats = {
+        "files_copied": 0,
+        "files_skipped": 0,
+        "files_removed": 0,
+        "bytes_copied": 0,
+        "bytes_skipped": 0,
+        "missing": missing,
+    }
+
+    manifest = {}
+    for rel, src in sources.items():
+        st = src.stat()
+        dest = bundle_dir / rel
+        entry = previous.get(rel)
+        try:
+            dest_size = dest.stat().st_size
+        except FileNotFoundError:
+            dest_size = None
+
+        digest = None
+        fresh = entry is not None and dest_size == st.st_size == entry["size"]
+        if fresh and entry["mtime_ns"] != st.st_mtime_ns:
+            digest = file_digest(src)
+            fresh = digest == entry["digest"]
+
+        if fresh:
+            stats["files_skipped"] += 1
+            stats["bytes_skipped"] += st.st_size
+            manifest[rel] = {**entry, "mtime_ns": st.st_mtime_ns}
+            continue
 
-def copy_item(src: Path, dest: Path) -> None:
-    if src.is_dir():
-        shutil.copytree(src, dest, dirs_exist_ok=True)
-    else:
         dest.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(src, dest)
+        manifest[rel] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "digest": digest or file_digest(src),
+            "mode": 0o755 if st.st_mode & 0o111 else 0o644,
+        }
+        stats["files_copied"] += 1
+        stats["bytes_copied"] += st.st_size
+        print(f"Updated: {rel}")
+
+    for rel in sorted(set(previous) - set(manifest)):
+        path = bundle_dir / rel
+        path.unlink(missing_ok=True)
+        stats["files_removed"] += 1
+        print(f"Removed: {rel}")
+        parent = path.parent
+        while parent != bundle_dir and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+    if manifest != previous:
+        save_manifest(bundle_dir, manifest)
+    stats["changed"] = bool(stats["files_copied"] or stats["files_removed"])
+    return stats
+
+
+def _first_party(module: str | None) -> bool:
+    """True if module names code in this repo (as opposed to a third-party package)."""
+    if not module:
+        return False
+    path = ROOT.joinpath(*module.split("."))
+    return path.with_suffix(".py").exists() or path.is_dir()
+
+
+def smoke_check(bundle_dir: Path = BUNDLE_DIR) -> list[str]:
+    """Import every bundled Python file in an isolated interpreter; return failures.
+
+    Only the bundle is on sys.path, so a first-party module missing from
+    INCLUDE_PATHS fails here rather than on a companion's machine. Missing
+    third-party packages are not the bundle's concern and are ignored.
+    """
+    names = sorted(rel for rel in load_manifest(bundle_dir) if rel.endswith(".py"))
+    if not names:
+        return []
+    result = subprocess.run(
+        [sys.executable, "-I", "-B", "-c", _SMOKE, str(bundle_dir), *names],
+        cwd=bundle_dir,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return [f"smoke interpreter failed: {result.stderr.strip()}"]
+    failures = []
+    for rel, missing, message in json.loads(result.stdout.strip().splitlines()[-1]):
+        if missing is not None and not _first_party(missing):
+            continue
+        failures.append(f"{rel}: {message}")
+    return failures
+
+
+def _source_epoch() -> int:
+    return max(int(os.getenv("SOURCE_DATE_EPOCH", DEFAULT_EPOCH)), DEFAULT_EPOCH)
+
+
+def _gzip_member(chunk: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # gzip wrapper, mtime 0
+    return compressor.compress(chunk) + compressor.flush()
+
+
+def write_tar_gz(bundle_dir: Path, out: Path, jobs: int, level: int = 9) -> None:
+    """Reproducible tar.gz: sorted members, fixed mtime/owner, parallel gzip.
+
+    The tar stream is cut into fixed-size chunks that are compressed
+    concurrently as separate gzip members; concatenated members are a valid
+    gzip file, and fixed chunking keeps the output byte-identical.
+    """
+    manifest = load_manifest(bundle_dir)
+    epoch = _source_epoch()
+    raw = io.BytesIO()
+    with tarfile.open(fileobj=raw, mode="w", format=tarfile.GNU_FORMAT) as tar:
+        for rel in sorted(manifest):
+            info = tarfile.TarInfo(f"companion_bundle/{rel}")
+            info.size = manifest[rel]["size"]
+            info.mtime = epoch
+            info.mode = manifest[rel].get("mode", 0o644)
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            with open(bundle_dir / rel, "rb") as handle:
+                tar.addfile(info, handle)
+
+    data = raw.getbuffer()
+    chunks = [bytes(data[i : i + GZIP_CHUNK]) for i in range(0, len(data), GZIP_CHUNK)]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:  # zlib releases the GIL
+        members = list(pool.map(lambda chunk: _gzip_member(chunk, level), chunks))
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_bytes(b"".join(members))
+    os.replace(tmp, out)
+
+
+def write_zip(bundle_dir: Path, out: Path) -> None:
+    """Reproducible zip: sorted members with a fixed timestamp (serial deflate)."""
+    manifest = load_manifest(bundle_dir)
+    date_time = time.gmtime(_source_epoch())[:6]
+    tmp = out.with_name(out.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for rel in sorted(manifest):
+            info = zipfile.ZipInfo(f"companion_bundle/{rel}", date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (0o100000 | manifest[rel].get("mode", 0o644)) << 16
+            archive.writestr(info, (bundle_dir / rel).read_bytes())
+    os.replace(tmp, out)
 
 
 def main() -> None:
-    if BUNDLE_DIR.exists():
+    parser = argparse.ArgumentParser(description="Build the companion bundle incrementally")
+    parser.add_argument(
+        "--archive",
+        action="append",
+        choices=["tar.gz", "zip"],
+        default=[],
+        help="Also emit a reproducible archive next to the bundle (repeatable)",
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Compression threads")
+    parser.add_argument("--clean", action="store_true", help="Delete the bundle and rebuild from scratch")
+    parser.add_argument("--no-smoke", action="store_true", help="Skip the bundle import check")
+    args = parser.parse_args()
+
+    if args.clean and BUNDLE_DIR.exists():
         shutil.rmtree(BUNDLE_DIR)
-    BUNDLE_DIR.mkdir(parents=True, exist_ok=True)
 
-    for rel in INCLUDE_PATHS:
-        src = ROOT / rel
-        if not src.exists():
-            print(f"Skipping missing path: {rel}")
+    stats = sync_bundle(BUNDLE_DIR)
+    for rel in stats["missing"]:
+        print(f"Skipping missing path: {rel}")
+
+    if not args.no_smoke:
+        failures = smoke_check(BUNDLE_DIR)
+        for failure in failures:
+            print(f"Bundle import failed: {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+    for kind in args.archive:
+        out = ROOT / f"companion_bundle.{kind}"
+        manifest_path = BUNDLE_DIR / MANIFEST_NAME
+        if out.exists() and out.stat().st_mtime_ns >= manifest_path.stat().st_mtime_ns:
+            print(f"Archive up to date: {out}")
             continue
-        dest = BUNDLE_DIR / rel
-        copy_item(src, dest)
-        print(f"Added: {rel}")
+        if kind == "tar.gz":
+            write_tar_gz(BUNDLE_DIR, out, jobs=max(1, args.jobs))
+        else:
+            write_zip(BUNDLE_DIR, out)
+        print(f"Archive written: {out}")
 
-    print(f"\nCompanion bundle created at: {BUNDLE_DIR}")
+    print(
+        f"\nCompanion bundle at: {BUNDLE_DIR}\n"
+        f"Copied {stats['files_copied']} files ({stats['bytes_copied']} bytes), "
+        f"skipped {stats['files_skipped']} ({stats['bytes_skipped']} bytes), "
+        f"removed {stats['files_removed']}."
+    )
 
 
 if __name__ == "__main__":
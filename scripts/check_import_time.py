@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for CLI entry points.
+
+Imports each entry point in a fresh interpreter under `-X importtime` and
+sums the cumulative time of the top-level modules it pulls in beyond bare
+interpreter startup. The best of --runs is compared to the entry point's
+budget; any overrun fails the check (exit 1). Used in CI so heavy imports
+(PyGithub, sqlite3, process pools, regex tables) stay off the startup path.
+
+Usage:
+    python scripts/check_import_time.py [--runs 5] [--scale 1.0] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# name -> (extra sys.path entry relative to ROOT_DIR, module, budget in ms).
+# Budgets leave ~50% headroom over a warm run; raise them deliberately.
+ENTRY_POINTS = {
+    "validate_artifacts": ("integrations/claude-skill/scripts", "validate_artifacts", 85),
+    "pre_commit_check": ("scripts", "pre_commit_check", 75),
+    "sync_detector": ("", "utils.sync_detector", 70),
+    "governance_task": (".cursor/tasks", "governance", 100),
+    "git_service": ("", "backend.services.git_service", 80),
+    "guardrails": ("", "guardrails.instruction_protection", 55),
+}
+
+# Modules that must never load just by importing the entry point.
+FORBIDDEN = {
+    "validate_artifacts": {"sqlite3", "concurrent.futures.process"},
+    "pre_commit_check": {"sqlite3", "guardrails.instruction_protection", "concurrent.futures"},
+    "git_service": {"github"},
+}
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Top-level module -> cumulative microseconds from `-X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue  # nested import, or the header line
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def run_importtime(code: str) -> dict[str, int]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.pop("IDSE_METRICS_JSON", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def measure(extra_path: str, module: str, runs: int, startup: set[str]) -> tuple[float, set[str]]:
+    paths = [str(ROOT_DIR)] + ([str(ROOT_DIR / extra_path)] if extra_path else [])
+    code = f"import sys; sys.path[:0] = {paths!r}; import {module}"
+    best = None
+    for _ in range(runs):
+        modules = run_importtime(code)
+        total = sum(us for name, us in modules.items() if name not in startup) / 1000
+        best = total if best is None else min(best, total)
+    # importtime only reports top-level entries reliably; list everything loaded.
+    listing = subprocess.run(
+        [sys.executable, "-c", code + "; print('\\n'.join(sys.modules))"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return best, set(listing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enforce import-time budgets for CLI entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow CI boxes)")
+    parser.add_argument("--only", help="Comma-separated entry point names")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    startup = set(run_importtime("pass"))
+    selected = args.only.split(",") if args.only else list(ENTRY_POINTS)
+    results = {}
+    failed = False
+    for name in selected:
+        extra_path, module, budget = ENTRY_POINTS[name]
+        budget *= args.scale
+        try:
+            ms, loaded = measure(extra_path, module, args.runs, startup)
+        except RuntimeError as exc:
+            results[name] = {"status": "error", "error": str(exc)}
+            failed = True
+            continue
+        forbidden = sorted(FORBIDDEN.get(name, set()) & loaded)
+        ok = ms <= budget and not forbidden
+        failed |= not ok
+        results[name] = {
+            "status": "pass" if ok else "fail",
+            "import_ms": round(ms, 1),
+            "budget_ms": round(budget, 1),
+            "forbidden_loaded": forbidden,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            if result["status"] == "error":
+                print(f"! {name}: {result['error']}")
+                continue
+            mark = "✓" if result["status"] == "pass" else "✗"
+            extra = f" (loads {', '.join(result['forbidden_loaded'])})" if result["forbidden_loaded"] else ""
+            print(f"{mark} {name}: {result['import_ms']} ms / {result['budget_ms']} ms{extra}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
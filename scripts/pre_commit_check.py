@@ -1,71 +1,200 @@
 from __future__ import annotations
 
+import argparse
+import os
 import re
 import subprocess
 import sys
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Optional
 
-from guardrails.instruction_protection import idse_boundary_guardrail
-from session_reader import SessionReader
-from utils.doc_reader import IDSEDocReader
-from utils.template_writer import TemplateWriter
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from session_reader import SessionReader  # noqa: E402
+from utils.doc_reader import IDSEDocReader  # noqa: E402
+from utils.marker_scanner import scan_markers  # noqa: E402
+from utils.metrics import SUBPROCESS_SECONDS, span  # noqa: E402
+
+if TYPE_CHECKING:
+    from utils.result_cache import ValidationCache
+
+# Guardrails, sqlite3 (validation cache) and the thread pool are imported by
+# the checks that need them, so `--check boundary` stays cheap to start.
+CHECKS = ("spec_compliance", "security", "boundary")
+
+
+SECRET_PATTERN = re.compile(
+    rb"(api[_-]?key|password|secret|token)\s*=\s*[\"'][^\"']+[\"']", re.I
+)
+NULL_SHA = "0" * 40
+SUBMODULE_MODE = "160000"
+BINARY_SNIFF_BYTES = 8000  # same window git uses to call a file binary
+
+
+class BlobReader:
+    """One persistent `git cat-file --batch` process for reading staged blobs."""
+
+    def __init__(self, base_dir: Path):
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=base_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, sha: str) -> Optional[bytes]:
+        self._proc.stdin.write(sha.encode("ascii") + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3:  # "<sha> missing"
+            return None
+        data = self._proc.stdout.read(int(header[2]))
+        self._proc.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self) -> None:
+        self._proc.stdin.close()
+        self._proc.wait()
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 class PreCommitValidator:
     """Lightweight pre-commit checks for spec compliance and basic safety."""
 
-    def __init__(self, base_dir: Path | str = Path(".")):
+    def __init__(
+        self,
+        base_dir: Path | str = Path("."),
+        max_scan_bytes: int = 1024 * 1024,
+        workers: Optional[int] = None,
+        use_cache: bool = True,
+    ):
         self.base_dir = Path(base_dir)
         self.session = SessionReader.get_active_session(base_dir=self.base_dir)
         self.reader = IDSEDocReader(base_dir=self.base_dir)
+        self.max_scan_bytes = max_scan_bytes
+        self.workers = workers or min(8, (os.cpu_count() or 1) + 2)
+        self._staged: Optional[list[tuple[str, Optional[str]]]] = None
+        self.use_cache = use_cache
+        self._cache: Optional[ValidationCache] = None
 
-    def run_all(self) -> dict:
-        return {
-            "spec_compliance": self.check_spec_compliance(),
-            "security": self.check_security(),
-            "boundary": self.check_boundary(),
-        }
+    @property
+    def cache(self) -> Optional[ValidationCache]:
+        if self.use_cache and self._cache is None:
+            from utils.result_cache import ValidationCache
+
+            self._cache = ValidationCache.open(self.base_dir)
+            self.use_cache = self._cache is not None
+        return self._cache
+
+    def run_all(self, checks: Iterable[str] = CHECKS) -> dict:
+        return {name: getattr(self, f"check_{name}")() for name in checks}
 
     def check_spec_compliance(self) -> dict:
         """Verify implementation aligns with spec markers (draft-safe)."""
-        try:
-            spec_text = self.reader.read("specs", "spec.md")
-        except FileNotFoundError:
+        spec_path = self.reader.resolve("specs", "spec.md")
+        if not spec_path:
             return {"status": "warn", "reason": "spec not found"}
 
-        is_draft = TemplateWriter.is_draft(spec_text)
-        unresolved = "[REQUIRES INPUT]" in spec_text
+        if self.cache is not None:
+            # Shares results with validate_artifacts.py for identical content.
+            scan = self.cache.scan(spec_path)
+            is_draft, unresolved = scan["draft"], scan["unresolved_count"] > 0
+        else:
+            # Count-only pass: both markers from one scan, no issue lines kept.
+            scan = scan_markers(spec_path, max_issues=0)
+            is_draft, unresolved = scan.draft, scan.unresolved_count > 0
         status = "pass"
         if unresolved and not is_draft:
             status = "fail"
         elif unresolved and is_draft:
             status = "warn"
-        return {
+        result = {
             "status": status,
             "draft": is_draft,
             "unresolved_markers": unresolved,
         }
+        if self.cache is not None:
+            result["cache"] = dict(self.cache.stats)
+        return result
 
     def check_security(self) -> dict:
-        """Simple hardcoded secret scan in changed files."""
-        files = self._changed_files()
-        pattern = re.compile(r"(api[_-]?key|password|secret|token)\s*=\s*[\"'][^\"']+[\"']", re.I)
+        """Hardcoded secret scan over the staged (index) content of changed files.
+
+        Blobs come from one `git cat-file --batch` stream. Binaries (NUL in
+        the first 8000 bytes) and blobs over max_scan_bytes are skipped, and
+        the regex scans run on a thread pool while later blobs are read.
+        """
+        entries = [(path, sha) for path, sha in self._staged_entries() if sha]
+        sizes = self._blob_sizes([sha for _, sha in entries])
+        oversize = [path for path, sha in entries if sizes.get(sha, 0) > self.max_scan_bytes]
+        to_read = [
+            (path, sha) for path, sha in entries if 0 <= sizes.get(sha, -1) <= self.max_scan_bytes
+        ]
         findings = []
-        for f in files:
-            path = self.base_dir / f
-            if not path.exists() or path.is_dir():
-                continue
-            text = path.read_text(errors="ignore")
-            if pattern.search(text):
-                findings.append(str(f))
+        binary = 0
+        scanned = 0
+
+        if to_read:
+            from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+            pending = {}
+            with BlobReader(self.base_dir) as blobs, ThreadPoolExecutor(self.workers) as pool:
+                for path, sha in to_read:
+                    data = blobs.read(sha)
+                    if data is None:
+                        continue
+                    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+                        binary += 1
+                        continue
+                    scanned += 1
+                    pending[pool.submit(SECRET_PATTERN.search, data)] = path
+                    if len(pending) >= self.workers * 4:
+                        # Bound memory: don't read far ahead of the scanners.
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            path_done = pending.pop(future)
+                            if future.result():
+                                findings.append(path_done)
+                findings.extend(path for f, path in pending.items() if f.result())
+
         return {
             "status": "pass" if not findings else "fail",
-            "findings": findings,
+            "findings": sorted(findings),
+            "scanned": scanned,
+            "skipped_binary": binary,
+            "skipped_oversize": oversize,
         }
 
+    def _blob_sizes(self, shas: list[str]) -> dict[str, int]:
+        if not shas:
+            return {}
+        with span(SUBPROCESS_SECONDS, command="git cat-file"):
+            result = subprocess.run(
+                ["git", "cat-file", "--batch-check"],
+                cwd=self.base_dir,
+                input="\n".join(shas) + "\n",
+                check=False,
+                capture_output=True,
+                text=True,
+            )
+        sizes = {}
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) == 3 and parts[1] == "blob":
+                sizes[parts[0]] = int(parts[2])
+        return sizes
+
     def check_boundary(self) -> dict:
         """Ensure changed files do not violate governance boundaries."""
+        from guardrails.instruction_protection import idse_boundary_guardrail
+
         files = self._changed_files()
         violations = []
         for f in files:
@@ -78,20 +207,65 @@ class PreCommitValidator:
         }
 
     def _changed_files(self) -> Iterable[str]:
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "--cached"],
-            cwd=self.base_dir,
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-        files = [line.strip() for line in result.stdout.splitlines() if line.strip()]
-        return files
+        return [path for path, _ in self._staged_entries()]
+
+    def _staged_entries(self) -> list[tuple[str, Optional[str]]]:
+        """(path, staged blob sha or None if deleted) from one `git diff --cached`."""
+        if self._staged is not None:
+            return self._staged
+
+        with span(SUBPROCESS_SECONDS, command="git diff"):
+            result = subprocess.run(
+                ["git", "diff", "--cached", "--raw", "-z", "--no-abbrev"],
+                cwd=self.base_dir,
+                check=False,
+                capture_output=True,
+                text=True,
+            )
+        fields = result.stdout.split("\0")
+        entries = []
+        i = 0
+        while i < len(fields) and fields[i].startswith(":"):
+            # ":<old mode> <new mode> <old sha> <new sha> <status>" then path(s)
+            _, new_mode, _, new_sha, status = fields[i][1:].split(" ")
+            paths = 2 if status[0] in "RC" else 1
+            path = fields[i + paths]
+            blob = None if new_sha == NULL_SHA or new_mode == SUBMODULE_MODE else new_sha
+            entries.append((path, blob))
+            i += 1 + paths
+
+        self._staged = entries
+        return entries
 
 
 def main():
-    validator = PreCommitValidator()
-    results = validator.run_all()
+    parser = argparse.ArgumentParser(description="IDSE pre-commit checks")
+    parser.add_argument(
+        "--max-scan-bytes",
+        type=int,
+        default=1024 * 1024,
+        help="Skip the secret scan for staged blobs larger than this (default 1 MiB)",
+    )
+    parser.add_argument("--workers", type=int, help="Secret-scan threads")
+    parser.add_argument(
+        "--check",
+        action="append",
+        choices=CHECKS,
+        help="Run only this check (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-scan the spec instead of reusing .idse_cache/validation.sqlite3",
+    )
+    args = parser.parse_args()
+
+    validator = PreCommitValidator(
+        max_scan_bytes=args.max_scan_bytes,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+    )
+    results = validator.run_all(args.check or CHECKS)
 
     print("Pre-commit check results:")
     for key, value in results.items():
@@ -1,39 +1,189 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from utils.metrics import RESOLUTION_SECONDS, timed
+
+
+@dataclass(frozen=True)
+class ActiveSession:
+    """Immutable, validated view of `.idse_active_session.json`."""
+
+    session_id: str
+    project: str
+    name: Optional[str] = None
+    owner: Optional[str] = None
+    created_at: Optional[float] = None
+    stage: Optional[str] = None
+    extra: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    REQUIRED_KEYS = ("session_id", "project")
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "ActiveSession":
+        """Build a session from parsed JSON, raising ValueError if invalid."""
+        if not isinstance(data, Mapping):
+            raise ValueError("Session metadata must be a JSON object")
+        for key in cls.REQUIRED_KEYS:
+            value = data.get(key)
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"Session metadata missing '{key}'")
+            if "/" in value or "\\" in value or value in (".", ".."):
+                raise ValueError(f"Session metadata '{key}' is not a plain name")
+        stage = data.get("stage")
+        if stage is not None and not isinstance(stage, str):
+            raise ValueError("Session metadata 'stage' must be a string")
+
+        known = {"session_id", "project", "name", "owner", "created_at", "stage"}
+        return cls(
+            session_id=data["session_id"],
+            project=data["project"],
+            name=data.get("name"),
+            owner=data.get("owner"),
+            created_at=data.get("created_at"),
+            stage=stage,
+            extra=MappingProxyType({k: v for k, v in data.items() if k not in known}),
+        )
+
+    def to_dict(self) -> dict:
+        """Return a fresh, mutable dict in the on-disk JSON shape."""
+        data = {
+            "session_id": self.session_id,
+            "name": self.name,
+            "created_at": self.created_at,
+            "owner": self.owner,
+            "project": self.project,
+            "stage": self.stage,
+        }
+        data = {k: v for k, v in data.items() if v is not None}
+        data.update(self.extra)
+        return data
+
+
+class SessionCache:
+    """Process-wide session metadata cache keyed on (path, st_mtime_ns, st_size).
+
+    A lookup costs a single `stat()`; the file is only re-read and re-parsed
+    when its mtime or size changes, or after an explicit invalidation.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._entries: dict[str, tuple[int, int, Optional[ActiveSession]]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0, "misses": 0, "parses": 0}
+
+    def get(self, session_path: Path) -> Optional[ActiveSession]:
+        key = os.path.abspath(session_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            with self._lock:
+                self._stats["lookups"] += 1
+                self._entries.pop(key, None)
+            return None
+
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            self._stats["lookups"] += 1
+            entry = self._entries.get(key) if self.enabled else None
+            if entry is not None and entry[:2] == signature:
+                self._stats["hits"] += 1
+                return entry[2]
+            self._stats["misses"] += 1
+
+        session = self._load(key)
+        if self.enabled:
+            with self._lock:
+                self._entries[key] = (*signature, session)
+        return session
+
+    def _load(self, key: str) -> Optional[ActiveSession]:
+        with self._lock:
+            self._stats["parses"] += 1
+        try:
+            with open(key, encoding="utf-8") as handle:
+                return ActiveSession.from_mapping(json.load(handle))
+        except (OSError, ValueError):
+            # JSONDecodeError is a ValueError; invalid metadata counts as no session.
+            return None
+
+    def invalidate(self, session_path: Path | None = None) -> None:
+        """Drop one cached entry, or everything when no path is given."""
+        with self._lock:
+            if session_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(session_path), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
 
 
 class SessionReader:
     """Read-only helper for accessing Agency-managed session metadata."""
 
     SESSION_FILE = Path(".idse_active_session.json")
+    cache = SessionCache(enabled=os.getenv("IDSE_SESSION_CACHE", "1") != "0")
+
+    @staticmethod
+    @timed(RESOLUTION_SECONDS, kind="session")
+    def get_session(base_dir: Path | str = Path(".")) -> Optional[ActiveSession]:
+        """Return the cached, validated session for base_dir, else None."""
+        return SessionReader.cache.get(Path(base_dir) / SessionReader.SESSION_FILE)
 
     @staticmethod
     def get_active_session(base_dir: Path | str = Path(".")) -> Optional[dict]:
         """Return parsed session metadata if available, else None."""
-        session_path = Path(base_dir) / SessionReader.SESSION_FILE
-        if not session_path.exists():
-            return None
+        session = SessionReader.get_session(base_dir=base_dir)
+        return session.to_dict() if session else None
 
-        try:
-            return json.loads(session_path.read_text())
-        except json.JSONDecodeError:
-            return None
+    @staticmethod
+    def invalidate(base_dir: Path | str | None = None) -> None:
+        """Forget cached metadata for base_dir (or for every directory)."""
+        if base_dir is None:
+            SessionReader.cache.invalidate()
+        else:
+            SessionReader.cache.invalidate(Path(base_dir) / SessionReader.SESSION_FILE)
+
+    @staticmethod
+    def refresh(base_dir: Path | str = Path(".")) -> Optional[ActiveSession]:
+        """Re-read the session file regardless of its stat signature."""
+        SessionReader.invalidate(base_dir)
+        return SessionReader.get_session(base_dir=base_dir)
 
     @staticmethod
     def build_session_path(
         stage: str,
         filename: str,
         base_dir: Path | str = Path("."),
+        session: ActiveSession | Mapping[str, Any] | None = None,
     ) -> str:
-        """Build session-scoped path or fallback to simple path when no session."""
-        session = SessionReader.get_active_session(base_dir=base_dir)
+        """Build session-scoped path or fallback to simple path when no session.
+
+        An explicit session (e.g. from utils/session_registry.py) is used as
+        is; otherwise the active session marker under base_dir is read.
+        """
+        if session is None:
+            session = SessionReader.get_session(base_dir=base_dir)
+        elif not isinstance(session, ActiveSession):
+            session = ActiveSession.from_mapping(session)
         if not session:
             return f"{stage}/{filename}"
 
         return (
-            f"{stage}/projects/{session['project']}/"
-            f"sessions/{session['session_id']}/{filename}"
+            f"{stage}/projects/{session.project}/"
+            f"sessions/{session.session_id}/{filename}"
         )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+from session_reader import ActiveSession
+
+STAGE_DIRS = ("intents", "contexts", "specs", "plans", "tasks")
+
+# Directory kinds, by their position in the artifact layout:
+#   root                -> <base>/                       (flat files + stage dirs)
+#   stage               -> <base>/<stage>/               (files + current/ + projects/)
+#   current             -> <base>/<stage>/current/       (files)
+#   projects            -> <base>/<stage>/projects/      (project dirs)
+#   project             -> <base>/<stage>/projects/<p>/  (sessions/)
+#   sessions            -> .../projects/<p>/sessions/    (session dirs)
+#   session             -> .../sessions/<s>/             (files)
+_CHILD_KINDS = {
+    "root": {name: "stage" for name in STAGE_DIRS},
+    "stage": {"current": "current", "projects": "projects"},
+    "projects": None,  # any child dir is a project
+    "project": {"sessions": "sessions"},
+    "sessions": None,  # any child dir is a session
+}
+_WILDCARD_CHILD = {"projects": "project", "sessions": "session"}
+
+
+class ArtifactIndex:
+    """Directory-listing index of IDSE artifacts built from one scandir walk.
+
+    Each relevant directory is listed once; lookups are set membership tests
+    instead of `stat()` calls. `refresh()` re-stats the known directories and
+    only re-lists those whose st_mtime_ns changed.
+    """
+
+    def __init__(self, base_dir: Path | str = Path(".")):
+        self.base_dir = Path(base_dir)
+        self._files: dict[str, frozenset[str]] = {}
+        self._subdirs: dict[str, frozenset[str]] = {}
+        self._mtimes: dict[str, int] = {}
+        self._kinds: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.stats = {"scans": 0, "refreshes": 0, "rescanned": 0}
+        self._walk(str(self.base_dir), "root")
+
+    def _walk(self, path: str, kind: str) -> None:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            entries = list(os.scandir(path))
+        except OSError:
+            self._forget(path)
+            return
+
+        self.stats["scans"] += 1
+        files = set()
+        subdirs = set()
+        children = _CHILD_KINDS.get(kind, {})
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if not is_dir:
+                if entry.is_file():
+                    files.add(entry.name)
+                continue
+            if children is None:
+                subdirs.add(entry.name)
+            elif entry.name in children:
+                subdirs.add(entry.name)
+
+        previous = self._subdirs.get(path, frozenset())
+        self._files[path] = frozenset(files)
+        self._subdirs[path] = frozenset(subdirs)
+        self._mtimes[path] = mtime
+        self._kinds[path] = kind
+
+        for name in previous - subdirs:
+            self._forget(os.path.join(path, name))
+        for name in subdirs:
+            child = os.path.join(path, name)
+            if child in self._mtimes:
+                # Already indexed; refresh() checks it against its own mtime.
+                continue
+            self._walk(child, _WILDCARD_CHILD.get(kind) or children[name])
+
+    def _forget(self, path: str) -> None:
+        prefix = path + os.sep
+        for table in (self._files, self._subdirs, self._mtimes, self._kinds):
+            for key in [k for k in table if k == path or k.startswith(prefix)]:
+                del table[key]
+
+    def refresh(self) -> int:
+        """Re-list directories whose mtime changed; return how many were re-listed."""
+        with self._lock:
+            self.stats["refreshes"] += 1
+            changed = []
+            for path, mtime in list(self._mtimes.items()):
+                try:
+                    current = os.stat(path).st_mtime_ns
+                except OSError:
+                    current = None
+                if current != mtime:
+                    changed.append(path)
+
+            # Parents first, so removed subtrees are dropped before children are visited.
+            rescanned = 0
+            for path in sorted(changed, key=len):
+                kind = self._kinds.get(path)
+                if kind is None:
+                    continue
+                self._walk(path, kind)
+                rescanned += 1
+            self.stats["rescanned"] += rescanned
+            return rescanned
+
+    def _dir(self, *parts: str) -> str:
+        return os.path.join(str(self.base_dir), *parts)
+
+    def contains(
+        self,
+        stage_dir: str,
+        filename: str,
+        project: Optional[str] = None,
+        session_id: Optional[str] = None,
+        current: bool = False,
+    ) -> bool:
+        """O(1) membership test for one artifact location."""
+        if project and session_id:
+            path = self._dir(stage_dir, "projects", project, "sessions", session_id)
+        elif current:
+            path = self._dir(stage_dir, "current")
+        else:
+            path = self._dir(stage_dir)
+        return filename in self._files.get(path, ())
+
+    def resolve(
+        self,
+        stage_dir: str,
+        filename: str,
+        session: Optional[ActiveSession] = None,
+    ) -> Optional[Path]:
+        """Return the first indexed path using the IDSEDocReader fallback order."""
+        if session and self.contains(
+            stage_dir, filename, session.project, session.session_id
+        ):
+            return (
+                self.base_dir
+                / stage_dir
+                / "projects"
+                / session.project
+                / "sessions"
+                / session.session_id
+                / filename
+            )
+        if not session and self.contains(stage_dir, filename):
+            # Without a session the "session path" is the stage path itself.
+            return self.base_dir / stage_dir / filename
+        if self.contains(stage_dir, filename, current=True):
+            return self.base_dir / stage_dir / "current" / filename
+        if self.contains(stage_dir, filename):
+            return self.base_dir / stage_dir / filename
+        if filename in self._files.get(str(self.base_dir), ()):
+            return self.base_dir / filename
+        return None
+
+    def sessions(self) -> Iterator[tuple[str, str]]:
+        """Yield every (project, session_id) pair found under any stage dir."""
+        seen = set()
+        for path, kind in list(self._kinds.items()):
+            if kind != "session":
+                continue
+            parts = Path(path).parts
+            pair = (parts[-3], parts[-1])
+            if pair not in seen:
+                seen.add(pair)
+                yield pair
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Mapping, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: locks degrade to no-ops
+    fcntl = None
+
+from session_reader import ActiveSession
+
+SessionLike = Union[ActiveSession, Mapping, None]
+
+
+def _read_umask() -> int:
+    """The process umask, read without changing it where /proc allows."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0o022)  # elsewhere reading it means setting it, so do it once at import
+    os.umask(mask)
+    return mask
+
+
+# Stands in for the ignored value on both sides of a comparison.
+_MASK = b"\0ignored\0"
+
+# os.umask is process-wide; toggling it per write would race with other threads.
+_UMASK = _read_umask()
+
+
+@contextmanager
+def file_lock(lock_path: Path | str) -> Iterator[None]:
+    """Hold an exclusive advisory (flock) lock on lock_path for the block.
+
+    The lock file is created if missing and is never removed; closing the
+    descriptor releases the lock, including when the process dies.
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _digest_bytes(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=20).digest()
+
+
+def _digest_file(path: Path) -> bytes:
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.digest()
+
+
+class ArtifactWriter:
+    """Atomic, write-if-changed file writes serialized per session.
+
+    Content is compared by size and BLAKE2b hash first; identical files are
+    left untouched so mtimes, watchers, caches and git stay quiet. Changed
+    content goes to a temp file in the target's directory and is renamed
+    over it, so readers never see a torn file. Writers for the same session
+    serialize on `.idse_cache/locks/<project>__<session_id>.lock`.
+
+    Rendered artifacts that embed a generation time would never compare
+    equal; callers pass `ignore`, a bytes pattern for that one value, and
+    the file is left alone when only its first match differs.
+    """
+
+    LOCK_DIR = Path(".idse_cache") / "locks"
+
+    def __init__(self, base_dir: Path | str = Path("."), fsync: Optional[bool] = None):
+        self.base_dir = Path(base_dir)
+        if fsync is None:
+            fsync = os.getenv("IDSE_FSYNC", "0") == "1"
+        self.fsync = fsync
+        self.stats = {"written": 0, "skipped": 0}
+        self._stats_lock = threading.Lock()
+
+    def lock_path(self, session: SessionLike) -> Path:
+        if isinstance(session, ActiveSession):
+            name = f"{session.project}__{session.session_id}"
+        elif session:
+            name = f"{session['project']}__{session['session_id']}"
+        else:
+            name = "_global"
+        return self.base_dir / self.LOCK_DIR / f"{name}.lock"
+
+    def session_lock(self, session: SessionLike):
+        return file_lock(self.lock_path(session))
+
+    @staticmethod
+    def unchanged(path: Path, data: bytes) -> bool:
+        try:
+            if os.stat(path).st_size != len(data):
+                return False
+            return _digest_file(path) == _digest_bytes(data)
+        except OSError:
+            return False
+
+    @staticmethod
+    def unchanged_except(path: Path, data: bytes, ignore: re.Pattern) -> bool:
+        """True if path matches data once the first `ignore` match in each is masked."""
+        try:
+            current = path.read_bytes()
+        except OSError:
+            return False
+        return ignore.sub(_MASK, current, count=1) == ignore.sub(_MASK, data, count=1)
+
+    def write(
+        self,
+        path: Path | str,
+        content: str | bytes,
+        session: SessionLike = None,
+        ignore: Optional[re.Pattern] = None,
+    ) -> bool:
+        """Write content to path unless it already matches; True if the file changed.
+
+        With `ignore`, a difference inside its first match (e.g. a generation
+        timestamp) does not count as a change.
+        """
+        path = Path(path)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        with self.session_lock(session):
+            if self.unchanged(path, data) or (
+                ignore is not None and self.unchanged_except(path, data, ignore)
+            ):
+                self._count("skipped")
+                return False
+            self._replace(path, data)
+        self._count("written")
+        return True
+
+    def _replace(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+                if self.fsync:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+        if self.fsync and hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
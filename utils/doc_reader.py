@@ -3,14 +3,32 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Optional
 
-from session_reader import SessionReader
+from session_reader import ActiveSession, SessionReader
+from utils.artifact_index import ArtifactIndex
+from utils.metrics import RESOLUTION_SECONDS, timed
 
 
 class IDSEDocReader:
-    """Session-aware document resolver with sensible fallbacks."""
+    """Session-aware document resolver with sensible fallbacks.
 
-    def __init__(self, base_dir: Path | str = Path(".")):
+    Pass `session` to resolve for that session instead of the one named in
+    `.idse_active_session.json` (the backend serves many at once).
+    """
+
+    def __init__(
+        self,
+        base_dir: Path | str = Path("."),
+        index: Optional[ArtifactIndex] = None,
+        session: Optional[ActiveSession] = None,
+    ):
         self.base_dir = Path(base_dir)
+        self.index = index
+        self.session = session
+
+    def _session(self) -> Optional[ActiveSession]:
+        if self.session is not None:
+            return self.session
+        return SessionReader.get_session(base_dir=self.base_dir)
 
     def _candidate_paths(self, stage_dir: str, filename: str) -> list[Path]:
         """Return ordered candidate paths for an artifact."""
@@ -21,6 +39,7 @@ class IDSEDocReader:
             stage_dir,
             filename,
             base_dir=self.base_dir,
+            session=self.session,
         )
         candidates.append(self.base_dir / session_path)
 
@@ -35,8 +54,11 @@ class IDSEDocReader:
 
         return candidates
 
+    @timed(RESOLUTION_SECONDS, kind="artifact")
     def resolve(self, stage_dir: str, filename: str) -> Optional[Path]:
         """Return the first existing path for the artifact, or None."""
+        if self.index is not None:
+            return self.index.resolve(stage_dir, filename, self._session())
         for candidate in self._candidate_paths(stage_dir, filename):
             if candidate.exists():
                 return candidate
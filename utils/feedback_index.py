@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from utils.artifact_writer import ArtifactWriter
+from utils.feedback_writer import SIDECAR_NAME, SIDECAR_VERSION
+from utils.governance_state import parse_since
+
+FEEDBACK_ROOT = Path("feedback") / "projects"
+MARKDOWN_NAME = "feedback.md"
+FAILED_RESULTS = {"fail", "failed", "failure", "error", "errored", "false", "red"}
+
+
+def _completed_ts(value: Optional[str]) -> float:
+    if not value:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _is_failure(value) -> bool:
+    if value is False:
+        return True
+    return str(value).strip().lower().split(" ")[0] in FAILED_RESULTS
+
+
+def parse_feedback_markdown(text: str) -> dict:
+    """Recover a sidecar-shaped record from a FeedbackWriter `feedback.md`.
+
+    Used for feedback written before sidecars existed; unknown sections are
+    ignored and missing ones come back empty.
+    """
+    sections: dict[str, list[str]] = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith("## "):
+            current = sections.setdefault(line[3:].strip(), [])
+        elif current is not None and line.strip():
+            current.append(line.strip())
+
+    def items(name: str) -> list[str]:
+        return [line[2:] for line in sections.get(name, []) if line.startswith("- ")]
+
+    def fields(name: str) -> dict[str, str]:
+        pairs = (item.partition(": ") for item in items(name))
+        return {key: value for key, sep, value in pairs if sep}
+
+    info = fields("Session Info")
+    status = fields("Status")
+    notes = "\n".join(sections.get("Developer Notes", []))
+    return {
+        "version": 0,
+        "session_id": info.get("Session"),
+        "project": info.get("Project"),
+        "owner": None,
+        "completed_at": info.get("Completed"),
+        "changed_files": items("Changes Made"),
+        "deviations": items("Deviations from Plan"),
+        "test_results": fields("Test Results"),
+        "notes": "" if notes == "None" else notes,
+        "status": status.get("Status"),
+        "next": status.get("Next"),
+    }
+
+
+def _as_list(value) -> list:
+    return list(value) if isinstance(value, (list, tuple)) else []
+
+
+def summarize(record: dict, rel: str) -> dict:
+    """The compact row kept in the index for one feedback entry."""
+    tests = record.get("test_results")
+    if not isinstance(tests, dict):  # hand-edited or foreign sidecars
+        tests = {}
+    return {
+        "path": rel,
+        "project": record.get("project"),
+        "session_id": record.get("session_id"),
+        "owner": record.get("owner"),
+        "completed_at": record.get("completed_at"),
+        "completed_ts": _completed_ts(record.get("completed_at")),
+        "status": record.get("status"),
+        "changed_files": len(_as_list(record.get("changed_files"))),
+        "deviations": _as_list(record.get("deviations")),
+        "failed_tests": sorted(str(name) for name, value in tests.items() if _is_failure(value)),
+        "tests": len(tests),
+        "source": "sidecar" if record.get("version", 0) >= 1 else "markdown",
+    }
+
+
+class FeedbackIndex:
+    """Project-wide index of feedback sidecars, updated incrementally.
+
+    Rows live in `.idse_cache/feedback_index.json` keyed by sidecar path
+    with the (mtime_ns, size) they were read at. `update()` lists the
+    feedback tree, re-reads only sidecars whose stat changed and drops rows
+    for deleted ones, so reports cost a directory walk plus the changes.
+    Sessions that only have a legacy `feedback.md` are indexed from it
+    until a sidecar appears.
+    """
+
+    INDEX_PATH = Path(".idse_cache") / "feedback_index.json"
+    INDEX_VERSION = 1
+
+    def __init__(self, base_dir: Path | str = Path(".")):
+        self.base_dir = Path(base_dir)
+        self.index_path = self.base_dir / self.INDEX_PATH
+        self.writer = ArtifactWriter(base_dir=self.base_dir)
+        self._entries: dict[str, dict] = self._load()
+        self._lock = threading.Lock()
+        self.stats = {"read": 0, "reused": 0, "removed": 0}
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != self.INDEX_VERSION or data.get("sidecar") != SIDECAR_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def _save(self) -> None:
+        payload = {
+            "version": self.INDEX_VERSION,
+            "sidecar": SIDECAR_VERSION,
+            "entries": self._entries,
+        }
+        try:
+            self.writer.write(self.index_path, json.dumps(payload, sort_keys=True, separators=(",", ":")))
+        except OSError:
+            pass  # read-only tree: the in-memory index still answers queries
+
+    def _sources(self) -> Iterator[tuple[str, os.stat_result]]:
+        """Yield (relative path, stat) of each session's sidecar, or its markdown if none."""
+        root = self.base_dir / FEEDBACK_ROOT
+        prefix = FEEDBACK_ROOT.as_posix()
+        for project in _subdirs(root):
+            for session in _subdirs(os.path.join(project.path, "sessions")):
+                names = {}
+                for entry in _scandir(session.path):
+                    if entry.name in (SIDECAR_NAME, MARKDOWN_NAME) and entry.is_file():
+                        names[entry.name] = entry
+                entry = names.get(SIDECAR_NAME) or names.get(MARKDOWN_NAME)
+                if entry is None:
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                yield f"{prefix}/{project.name}/sessions/{session.name}/{entry.name}", st
+
+    def _read(self, rel: str) -> Optional[dict]:
+        path = self.base_dir / rel
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        if path.name == MARKDOWN_NAME:
+            return parse_feedback_markdown(text)
+        try:
+            record = json.loads(text)
+        except ValueError:
+            return None
+        return record if isinstance(record, dict) else None
+
+    def update(self, rebuild: bool = False) -> dict:
+        """Bring the index in line with the feedback tree; return read/reused/removed counts."""
+        with self._lock:
+            if rebuild:
+                self._entries = {}
+            changes = {"read": 0, "reused": 0, "removed": 0}
+            seen = set()
+            for rel, st in self._sources():
+                seen.add(rel)
+                entry = self._entries.get(rel)
+                if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                    changes["reused"] += 1
+                    continue
+                record = self._read(rel)
+                if record is None:
+                    self._entries.pop(rel, None)
+                    continue
+                self._entries[rel] = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "row": summarize(record, rel),
+                }
+                changes["read"] += 1
+            for rel in set(self._entries) - seen:
+                del self._entries[rel]
+                changes["removed"] += 1
+            if changes["read"] or changes["removed"] or not self.index_path.exists():
+                self._save()
+            for key, value in changes.items():
+                self.stats[key] += value
+            return changes
+
+    def rows(self) -> list[dict]:
+        return [entry["row"] for entry in self._entries.values()]
+
+    def query(
+        self,
+        project: Optional[str] = None,
+        owner: Optional[str] = None,
+        since: str | float | None = None,
+        until: str | float | None = None,
+        deviated: Optional[bool] = None,
+        failing: Optional[bool] = None,
+    ) -> list[dict]:
+        """Rows matching every given filter, newest first."""
+        start = parse_since(since)
+        end = parse_since(until) if until is not None else None
+        matches = []
+        for row in self.rows():
+            if project is not None and row["project"] != project:
+                continue
+            if owner is not None and row["owner"] != owner:
+                continue
+            if row["completed_ts"] < start or (end is not None and row["completed_ts"] >= end):
+                continue
+            if deviated is not None and bool(row["deviations"]) != deviated:
+                continue
+            if failing is not None and bool(row["failed_tests"]) != failing:
+                continue
+            matches.append(row)
+        matches.sort(key=lambda row: (row["completed_ts"], row["path"]), reverse=True)
+        return matches
+
+
+def summary(rows: Iterable[dict]) -> dict:
+    """Totals and per-project counts for a set of index rows."""
+    result = {"sessions": 0, "deviated": 0, "failing": 0, "projects": {}}
+    for row in rows:
+        project = result["projects"].setdefault(row["project"], {"sessions": 0, "deviated": 0, "failing": 0})
+        for counts in (result, project):
+            counts["sessions"] += 1
+            counts["deviated"] += bool(row["deviations"])
+            counts["failing"] += bool(row["failed_tests"])
+    return result
+
+
+def _scandir(path: str | Path) -> list[os.DirEntry]:
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except OSError:
+        return []
+
+
+def _subdirs(path: str | Path) -> list[os.DirEntry]:
+    return sorted((e for e in _scandir(path) if e.is_dir()), key=lambda e: e.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query feedback across all IDSE sessions")
+    parser.add_argument("--base-dir", default=".")
+    parser.add_argument("--project")
+    parser.add_argument("--owner")
+    parser.add_argument("--since", help="ISO date/time or epoch seconds")
+    parser.add_argument("--until", help="ISO date/time or epoch seconds (exclusive)")
+    parser.add_argument("--deviated", action="store_true", help="Only sessions that deviated from plan")
+    parser.add_argument("--failing", action="store_true", help="Only sessions with failing tests")
+    parser.add_argument("--rebuild", action="store_true", help="Discard the cached index first")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    index = FeedbackIndex(args.base_dir)
+    changes = index.update(rebuild=args.rebuild)
+    rows = index.query(
+        project=args.project,
+        owner=args.owner,
+        since=args.since,
+        until=args.until,
+        deviated=True if args.deviated else None,
+        failing=True if args.failing else None,
+    )
+
+    if args.json:
+        print(json.dumps({"index": changes, "summary": summary(rows), "sessions": rows}, indent=2))
+        return
+
+    totals = summary(rows)
+    print(
+        f"{totals['sessions']} session(s), {totals['deviated']} deviated, {totals['failing']} failing "
+        f"(index: {changes['read']} read, {changes['reused']} reused, {changes['removed']} removed)"
+    )
+    for row in rows:
+        flags = []
+        if row["deviations"]:
+            flags.append(f"{len(row['deviations'])} deviation(s)")
+        if row["failed_tests"]:
+            flags.append("failing: " + ", ".join(row["failed_tests"]))
+        print(f"- {row['project']}/{row['session_id']} {row['completed_at']}" + (f" [{'; '.join(flags)}]" if flags else ""))
+
+
+if __name__ == "__main__":
+    main()
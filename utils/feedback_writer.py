@@ -1,17 +1,30 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable
 
 from session_reader import SessionReader
+from utils.artifact_writer import ArtifactWriter
+
+# Bump when the sidecar shape changes; utils/feedback_index.py reads it.
+SIDECAR_VERSION = 1
+SIDECAR_NAME = "feedback.json"
 
 
 class FeedbackWriter:
-    """Write implementation feedback in session-aware paths."""
+    """Write implementation feedback in session-aware paths.
+
+    Next to each `feedback.md` a `feedback.json` sidecar carries the same
+    data in structured form, so reports can skip parsing the markdown.
+    Writing the same feedback again keeps the recorded completion time, so
+    neither file changes.
+    """
 
     def __init__(self, base_dir: Path | str = Path(".")):
         self.base_dir = Path(base_dir)
+        self.writer = ArtifactWriter(base_dir=self.base_dir)
 
     def write_feedback(
         self,
@@ -34,19 +47,68 @@ class FeedbackWriter:
             / "feedback.md"
         )
 
-        content = self._build_content(
-            session_id=session["session_id"],
-            project=session["project"],
+        record = self.build_record(
+            session=session,
             changed_files=list(changed_files),
             deviations=list(deviations or []),
             test_results=test_results or {},
             notes=notes or "",
         )
+        sidecar_path = feedback_path.with_name(SIDECAR_NAME)
+        previous = self._read_sidecar(sidecar_path)
+        if previous.get("completed_at"):
+            same = json.loads(json.dumps(record, default=str))
+            same["completed_at"] = previous["completed_at"]
+            if same == previous:
+                record["completed_at"] = previous["completed_at"]
+        content = self._build_content(
+            session_id=record["session_id"],
+            project=record["project"],
+            changed_files=record["changed_files"],
+            deviations=record["deviations"],
+            test_results=record["test_results"],
+            notes=record["notes"],
+            timestamp=record["completed_at"],
+        )
 
-        feedback_path.parent.mkdir(parents=True, exist_ok=True)
-        feedback_path.write_text(content)
+        # Serialize before writing either file, so a bad value cannot leave
+        # feedback.md without its sidecar; values JSON lacks become strings.
+        sidecar = json.dumps(record, indent=2, sort_keys=True, default=str) + "\n"
+        self.writer.write(feedback_path, content, session=session)
+        self.writer.write(sidecar_path, sidecar, session=session)
         return feedback_path
 
+    @staticmethod
+    def _read_sidecar(path: Path) -> dict:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def build_record(
+        session: dict,
+        changed_files: list[str],
+        deviations: list[str],
+        test_results: dict,
+        notes: str,
+    ) -> dict:
+        """The structured sidecar for one feedback entry."""
+        return {
+            "version": SIDECAR_VERSION,
+            "session_id": session["session_id"],
+            "project": session["project"],
+            "owner": session.get("owner"),
+            "completed_at": datetime.utcnow().isoformat() + "Z",
+            "changed_files": changed_files,
+            "deviations": deviations,
+            "test_results": {str(k): v for k, v in test_results.items()},
+            "notes": notes,
+            "status": "completed_locally",
+            "next": "awaiting_ci_validation",
+        }
+
     def _build_content(
         self,
         session_id: str,
@@ -55,8 +117,9 @@ class FeedbackWriter:
         deviations: list[str],
         test_results: dict,
         notes: str,
+        timestamp: str | None = None,
     ) -> str:
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        timestamp = timestamp or datetime.utcnow().isoformat() + "Z"
         changed = "\n".join(f"- {path}" for path in changed_files) or "None"
         devs = "\n".join(f"- {d}" for d in deviations) or "None"
         tests = "\n".join(f"- {k}: {v}" for k, v in test_results.items()) or "Not run"
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from utils.artifact_writer import ArtifactWriter, file_lock
+
+STATE_DIR = Path("idse-governance") / "state"
+EVENT_TYPES = ("handoff", "role")
+
+
+def _stamp(ts: float) -> str:
+    # Same minute-resolution format the governance tasks have always written,
+    # in UTC so the "Z" is true and parse_since() reads it back unchanged.
+    return time.strftime("%Y-%m-%dT%H:%MZ", time.gmtime(ts))
+
+
+def parse_since(value: str | float | None) -> float:
+    """Accept epoch seconds or an ISO-8601 date/time ("2025-12-11", "...T10:00Z")."""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def apply_event(state: dict, event: dict) -> dict:
+    """Fold one logged event into a state dict (in place) and return it."""
+    data = event["data"]
+    stamp = _stamp(event["ts"])
+    if event["type"] == "handoff":
+        state.update(
+            {
+                "active_llm": data["to"],
+                "awaiting_handoff": True,
+                "handoff_cycle_id": stamp,
+                "last_handoff": {
+                    "from": data["from"],
+                    "to": data["to"],
+                    "timestamp": stamp,
+                    "reason": data.get("reason", ""),
+                },
+            }
+        )
+    elif event["type"] == "role":
+        state["role_change_event"] = {"role": data["role"], "timestamp": stamp}
+    else:
+        raise ValueError(f"Unknown governance event type: {event['type']}")
+    return state
+
+
+class GovernanceStateStore:
+    """Governance state as a snapshot plus an append-only event log.
+
+    Handoff and role changes are appended to `events.jsonl` under an
+    exclusive lock; `state.json` stays the readable snapshot and records
+    the last event seq it covers (`compaction`). Current state is the
+    snapshot plus the logged events after that seq. Where that tail
+    starts in the log is cached outside the tracked tree
+    (`.idse_cache/governance_offset.json`) and only trusted if the event
+    ending there still has the snapshot's seq; otherwise, e.g. after the
+    log was replaced or deleted, the whole log is replayed. The tail
+    is folded back into the snapshot every `compact_every` events and
+    whenever `current()` reads state, so `state.json` only lags the log
+    between a write and the next read through this store. The log itself
+    is never rewritten, so handoff history is kept in full.
+    """
+
+    SNAPSHOT = "state.json"
+    EVENTS = "events.jsonl"
+    LOCK = ".state.lock"
+    OFFSET_PATH = Path(".idse_cache") / "governance_offset.json"
+
+    def __init__(self, base_dir: Path | str = Path("."), compact_every: int = 50):
+        self.base_dir = Path(base_dir)
+        self.state_dir = self.base_dir / STATE_DIR
+        self.snapshot_path = self.state_dir / self.SNAPSHOT
+        self.events_path = self.state_dir / self.EVENTS
+        self.offset_path = self.base_dir / self.OFFSET_PATH
+        self.compact_every = compact_every
+        self.writer = ArtifactWriter(base_dir=self.base_dir)
+
+    def locked(self):
+        return file_lock(self.state_dir / self.LOCK)
+
+    def _load_snapshot(self) -> dict:
+        try:
+            return json.loads(self.snapshot_path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _read_events(self, offset: int) -> Iterator[tuple[int, int, dict]]:
+        """Yield (start, end, event) for complete log lines from offset on."""
+        try:
+            handle = open(self.events_path, "rb")
+        except FileNotFoundError:
+            return
+        with handle:
+            handle.seek(offset)
+            for line in handle:
+                start, offset = offset, offset + len(line)
+                if not line.endswith(b"\n"):
+                    break  # torn final line from an interrupted append
+                try:
+                    yield start, offset, json.loads(line)
+                except ValueError:
+                    continue
+
+    def _load_offset(self) -> dict:
+        try:
+            return json.loads(self.offset_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_offset(self, position: dict) -> None:
+        if "end" not in position:
+            return  # the covered event is no longer in the log
+        hint = {key: position[key] for key in ("seq", "start", "end")}
+        try:
+            self.writer.write(self.offset_path, json.dumps(hint) + "\n")
+        except OSError:
+            pass  # read-only tree: the next read replays the whole log
+
+    def _resume_offset(self, seq: int) -> int:
+        """Log offset just after event seq, if the cached one still checks out; else 0."""
+        hint = self._load_offset()
+        if not seq or hint.get("seq") != seq:
+            return 0
+        try:
+            with open(self.events_path, "rb") as handle:
+                if hint["end"] > os.fstat(handle.fileno()).st_size:
+                    return 0
+                handle.seek(hint["start"])
+                line = handle.readline()
+            if hint["start"] + len(line) == hint["end"] and json.loads(line)["seq"] == seq:
+                return hint["end"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return 0
+
+    def _replay(self) -> tuple[dict, dict]:
+        """Snapshot plus the logged events after it, and the position of the last one."""
+        state = self._load_snapshot()
+        compaction = state.get("compaction") or {}
+        position = {"seq": compaction.get("seq", 0), "ts": compaction.get("ts", 0.0)}
+        for start, end, event in self._read_events(self._resume_offset(position["seq"])):
+            if event["seq"] < position["seq"]:
+                continue  # already folded into the snapshot
+            if event["seq"] > position["seq"]:
+                apply_event(state, event)
+            position = {"seq": event["seq"], "ts": event["ts"], "start": start, "end": end}
+        return state, position
+
+    def current(self) -> dict:
+        """Current state: the snapshot plus events appended since its last compaction.
+
+        A pending tail is written back to state.json on the way.
+        """
+        state, position = self._replay()
+        if position["seq"] > (state.get("compaction") or {}).get("seq", 0):
+            try:
+                with self.locked():
+                    state, position = self._replay()
+                    self._write_snapshot(state, position)
+            except OSError:
+                pass  # read-only tree: the replayed state is still current
+        elif "end" in position and self._load_offset().get("end") != position["end"]:
+            self._save_offset(position)  # the cached offset was stale; skip the full replay next time
+        state.pop("compaction", None)
+        return state
+
+    def record(self, event_type: str, data: dict) -> dict:
+        """Append one event and return the resulting state."""
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown governance event type: {event_type}")
+        with self.locked():
+            state, position = self._replay()
+            event = {
+                "seq": position["seq"] + 1,
+                # Monotonic even if the clock steps back, so history can bisect on ts.
+                "ts": max(time.time(), position["ts"]),
+                "type": event_type,
+                "data": data,
+            }
+            apply_event(state, event)
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            line = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+            fd = os.open(self.events_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                start = os.fstat(fd).st_size
+                if start and os.pread(fd, 1, start - 1) != b"\n":
+                    os.write(fd, b"\n")  # terminate a torn line so this event stays parseable
+                    start += 1
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+            compacted = (state.get("compaction") or {}).get("seq", 0)
+            if event["seq"] - compacted >= self.compact_every:
+                position = {"seq": event["seq"], "ts": event["ts"], "start": start, "end": start + len(line)}
+                self._write_snapshot(state, position)
+        state.pop("compaction", None)
+        return state
+
+    def handoff(self, frm: str, to: str, reason: str = "") -> dict:
+        return self.record("handoff", {"from": frm, "to": to, "reason": reason})
+
+    def role(self, role_name: str) -> dict:
+        return self.record("role", {"role": role_name})
+
+    def compact(self) -> dict:
+        """Fold all logged events into state.json now; returns the last folded event's position."""
+        with self.locked():
+            state, position = self._replay()
+            self._write_snapshot(state, position)
+        return position
+
+    def _write_snapshot(self, state: dict, position: dict) -> None:
+        # state.json is tracked, so it keeps only the seq; byte offsets stay in the cache.
+        state["compaction"] = {"seq": position["seq"], "ts": position["ts"]}
+        self.writer.write(self.snapshot_path, json.dumps(state, indent=2) + "\n")
+        self._save_offset(position)
+
+    @staticmethod
+    def _line_at(handle, pos: int) -> tuple[int, bytes]:
+        """Start offset and content of the first line starting at or after pos."""
+        if pos:
+            handle.seek(pos - 1)
+            handle.readline()
+        else:
+            handle.seek(0)
+        return handle.tell(), handle.readline()
+
+    def _seek_ts(self, since: float) -> int:
+        """Byte offset of the first event with ts >= since, by bisecting the log."""
+        try:
+            handle = open(self.events_path, "rb")
+        except FileNotFoundError:
+            return 0
+        with handle:
+            low, high = 0, os.fstat(handle.fileno()).st_size
+            while low < high:
+                mid = (low + high) // 2
+                start, line = self._line_at(handle, mid)
+                try:
+                    older = bool(line) and json.loads(line)["ts"] < since
+                except (ValueError, KeyError):
+                    older = True
+                if older:
+                    low = start + 1
+                else:
+                    high = mid
+            return self._line_at(handle, low)[0]
+
+    def history(
+        self,
+        since: str | float | None = None,
+        event_type: Optional[str] = "handoff",
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """Logged events (handoffs by default) at or after `since`, oldest first."""
+        since_ts = parse_since(since)
+        offset = self._seek_ts(since_ts) if since_ts else 0
+        events = []
+        for _, _, event in self._read_events(offset):
+            if event["ts"] < since_ts or (event_type and event["type"] != event_type):
+                continue
+            events.append({**event, "timestamp": _stamp(event["ts"])})
+            if limit and len(events) >= limit:
+                break
+        return events
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+DEFAULT_CONFIG = Path("idse-agent-config-distributed.yaml")
+# (top-level key, list key) pairs that declare preload documents, in the
+# distributed manifests and in idse-agent-config.yaml respectively.
+PRELOAD_KEYS = (("shared_knowledge", "preload"), ("knowledge_base", "preload"))
+
+# ATX headings, plus code fences so `# comments` inside them are skipped.
+_LINE = re.compile(
+    rb"^(?:(?P<fence>```|~~~)[^\n]*|(?P<hashes>#{1,6})[ \t]+(?P<title>[^\r\n]*?)[ \t#]*)\r?$",
+    re.MULTILINE,
+)
+
+
+def estimate_tokens(size: int) -> int:
+    """Rough token count for `size` bytes of English markdown (~4 bytes per token)."""
+    return (size + 3) // 4
+
+
+def read_preload_list(config_path: Path | str) -> list[str]:
+    """Preload paths declared in an agent config, as written in the file."""
+    text = Path(config_path).read_text(encoding="utf-8")
+    try:  # PyYAML is optional; the fallback reader handles the preload lists
+        import yaml
+    except ImportError:  # pragma: no cover - depends on the environment
+        yaml = None
+    if yaml is not None:
+        data = yaml.safe_load(text) or {}
+        for top, key in PRELOAD_KEYS:
+            block = data.get(top)
+            if isinstance(block, dict) and isinstance(block.get(key), list):
+                return [str(item) for item in block[key]]
+        return []
+    return _read_preload_fallback(text)
+
+
+def _read_preload_fallback(text: str) -> list[str]:
+    """Minimal reader for `<top>:\\n  preload:\\n    - path` blocks (no PyYAML)."""
+    wanted = dict(PRELOAD_KEYS)
+    top = None
+    in_list = False
+    items: list[str] = []
+    for raw in text.splitlines():
+        line = raw.split(" #", 1)[0].rstrip()
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        stripped = line.strip()
+        if indent == 0:
+            if items:
+                return items
+            top = stripped[:-1] if stripped.endswith(":") else None
+            in_list = False
+        elif top in wanted and stripped == f"{wanted[top]}:":
+            in_list = True
+        elif in_list and stripped.startswith("- "):
+            items.append(stripped[2:].strip().strip("'\""))
+        elif in_list:
+            if items:
+                return items
+            in_list = False
+    return items
+
+
+@dataclass(frozen=True)
+class Section:
+    """One heading and its body, as byte offsets into the mapped document."""
+
+    title: str
+    level: int  # 1-6 for headings; 0 for text before the first heading
+    start: int  # heading line start
+    body: int  # first byte after the heading line
+    end: int  # start of the next heading (any level), or end of file
+    tokens: int
+
+
+def index_sections(buf) -> list[Section]:
+    """Heading/section offset index of a markdown buffer (bytes or mmap)."""
+    headings: list[tuple[int, int, int, str]] = []
+    in_fence = False
+    for match in _LINE.finditer(buf):
+        if match.group("fence"):
+            in_fence = not in_fence
+        elif not in_fence:
+            title = match.group("title").decode("utf-8", errors="replace").strip()
+            headings.append((match.start(), match.end(), len(match.group("hashes")), title))
+
+    size = len(buf)
+    sections = []
+    first = headings[0][0] if headings else size
+    if buf[:first].strip():
+        sections.append(Section("", 0, 0, 0, first, estimate_tokens(first)))
+    for position, (start, line_end, level, title) in enumerate(headings):
+        end = headings[position + 1][0] if position + 1 < len(headings) else size
+        body = min(line_end + 1, end)
+        sections.append(Section(title, level, start, body, end, estimate_tokens(end - start)))
+    return sections
+
+
+class PreloadDoc:
+    """A preload document mapped read-only, with its section index."""
+
+    def __init__(self, rel: str, path: Path):
+        self.rel = rel
+        self.path = path
+        st = path.stat()
+        self.signature = (st.st_mtime_ns, st.st_size)
+        with open(path, "rb") as handle:
+            # Empty files cannot be mapped; b"" serves the same API.
+            self.buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else b""
+        self.sections = index_sections(self.buf)
+        self.tokens = estimate_tokens(len(self.buf))
+
+    def stale(self) -> bool:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return True
+        return (st.st_mtime_ns, st.st_size) != self.signature
+
+    def view(self, section: Optional[Section] = None, children: bool = False) -> memoryview:
+        """Zero-copy slice of the document (or one section, optionally with its subsections)."""
+        if section is None:
+            return memoryview(self.buf)
+        end = self.subtree_end(section) if children else section.end
+        return memoryview(self.buf)[section.start : end]
+
+    def subtree_end(self, section: Section) -> int:
+        """End of section including every deeper heading nested under it."""
+        if section.level == 0:
+            return section.end
+        for other in self.sections:
+            if other.start > section.start and 0 < other.level <= section.level:
+                return other.start
+        return len(self.buf)
+
+    def find(self, title: str) -> Optional[Section]:
+        """First section whose title matches exactly, else the first that starts with title (case-insensitive)."""
+        wanted = title.strip().lower()
+        prefix = None
+        for section in self.sections:
+            current = section.title.lower()
+            if current == wanted:
+                return section
+            if prefix is None and current.startswith(wanted):
+                prefix = section
+        return prefix
+
+    def close(self) -> None:
+        if isinstance(self.buf, mmap.mmap):
+            try:
+                self.buf.close()
+            except BufferError:
+                pass  # views handed out still pin it; unmapped once they are released
+
+
+class KnowledgePreload:
+    """Shared-knowledge preload set, memory-mapped once per process.
+
+    Every document listed under `shared_knowledge.preload` is mapped
+    read-only; agent processes on one host that map the same files share
+    the page cache, so the set is read from disk once however many agents
+    run. Sections are served as memoryview slices of the map (no copies).
+    Missing paths are collected in `missing` when the set is loaded.
+    Lookups re-stat the sources at most every `check_interval` seconds
+    and remap only documents whose mtime or size changed. Views stay valid
+    after a remap as long as sources are replaced (write + rename) rather
+    than truncated in place.
+    """
+
+    def __init__(
+        self,
+        config_path: Path | str = DEFAULT_CONFIG,
+        base_dir: Path | str | None = None,
+        check_interval: float = 1.0,
+    ):
+        self.config_path = Path(config_path)
+        self.base_dir = Path(base_dir) if base_dir is not None else self.config_path.resolve().parent
+        self.check_interval = check_interval
+        self.documents: dict[str, PreloadDoc] = {}
+        self.missing: list[str] = []
+        self.declared: list[str] = []
+        self._checked = 0.0
+        self._lock = threading.RLock()
+        self.stats = {"loads": 0, "reloads": 0, "checks": 0}
+
+    def _resolve(self, entry: str) -> tuple[str, Path]:
+        rel = Path(entry).as_posix()
+        rel = rel[2:] if rel.startswith("./") else rel
+        return rel, self.base_dir / rel
+
+    def load(self) -> "KnowledgePreload":
+        """Map every declared document and record the ones that are missing."""
+        with self._lock:
+            self.declared = read_preload_list(self.config_path)
+            for doc in self.documents.values():
+                doc.close()
+            self.documents, self.missing = {}, []
+            for entry in self.declared:
+                rel, path = self._resolve(entry)
+                try:
+                    self.documents[rel] = PreloadDoc(rel, path)
+                except OSError:
+                    self.missing.append(rel)
+            self._checked = time.monotonic()
+            self.stats["loads"] += 1
+        return self
+
+    def refresh(self, force: bool = False) -> list[str]:
+        """Remap changed documents (and pick up created/deleted ones); return their paths."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked < self.check_interval:
+                return []
+            self._checked = now
+            self.stats["checks"] += 1
+            changed = []
+            for entry in self.declared:
+                rel, path = self._resolve(entry)
+                doc = self.documents.get(rel)
+                if doc is not None and not doc.stale():
+                    continue
+                if doc is not None:
+                    doc.close()
+                    del self.documents[rel]
+                try:
+                    self.documents[rel] = PreloadDoc(rel, path)
+                except OSError:
+                    if rel not in self.missing:
+                        self.missing.append(rel)
+                else:
+                    if rel in self.missing:
+                        self.missing.remove(rel)
+                changed.append(rel)
+            self.stats["reloads"] += len(changed)
+            return changed
+
+    def document(self, rel: str) -> Optional[PreloadDoc]:
+        self.refresh()
+        rel, _ = self._resolve(rel)
+        return self.documents.get(rel)
+
+    def section(self, rel: str, title: str, children: bool = False) -> Optional[memoryview]:
+        """Zero-copy bytes of one section of a preload document, or None."""
+        doc = self.document(rel)
+        if doc is None:
+            return None
+        section = doc.find(title)
+        return doc.view(section, children=children) if section else None
+
+    def sections(self) -> Iterator[tuple[PreloadDoc, Section]]:
+        self.refresh()
+        for doc in list(self.documents.values()):
+            for section in doc.sections:
+                yield doc, section
+
+    def report(self) -> dict:
+        """Per-document size, section count and token estimate, plus missing paths."""
+        self.refresh()
+        documents = {
+            rel: {"bytes": len(doc.buf), "sections": len(doc.sections), "tokens": doc.tokens}
+            for rel, doc in self.documents.items()
+        }
+        return {
+            "config": str(self.config_path),
+            "documents": documents,
+            "missing": list(self.missing),
+            "total_tokens": sum(doc["tokens"] for doc in documents.values()),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for doc in self.documents.values():
+                doc.close()
+            self.documents = {}
+
+
+_PRELOAD: Optional[KnowledgePreload] = None
+_PRELOAD_LOCK = threading.Lock()
+
+
+def get_kb_preload() -> KnowledgePreload:
+    """Return the process-wide preload set (IDSE_KB_CONFIG overrides the manifest), loading it on first use."""
+    global _PRELOAD
+    with _PRELOAD_LOCK:
+        if _PRELOAD is None:
+            _PRELOAD = KnowledgePreload(os.getenv("IDSE_KB_CONFIG", str(DEFAULT_CONFIG))).load()
+            for rel in _PRELOAD.missing:
+                print(f"warning: preload document missing: {rel}", file=sys.stderr)
+        return _PRELOAD
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and index the shared-knowledge preload set")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG))
+    parser.add_argument("--sections", action="store_true", help="List every section with its token estimate")
+    parser.add_argument("--show", nargs=2, metavar=("DOC", "HEADING"), help="Print one section")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    kb = KnowledgePreload(args.config).load()
+    if args.show:
+        view = kb.section(args.show[0], args.show[1], children=True)
+        if view is None:
+            print(f"No section '{args.show[1]}' in {args.show[0]}", file=sys.stderr)
+            sys.exit(1)
+        sys.stdout.write(bytes(view).decode("utf-8", errors="replace"))
+        return
+
+    report = kb.report()
+    if args.sections:
+        report["sections"] = [
+            {"doc": doc.rel, "title": s.title, "level": s.level, "start": s.start, "end": s.end, "tokens": s.tokens}
+            for doc, s in kb.sections()
+        ]
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for rel, info in report["documents"].items():
+            print(f"✓ {rel}: {info['sections']} sections, ~{info['tokens']} tokens")
+        for section in report.get("sections", []):
+            print(f"    {'#' * section['level']} {section['title']} (~{section['tokens']} tokens)")
+        for rel in report["missing"]:
+            print(f"✗ missing: {rel}")
+        print(f"Total: ~{report['total_tokens']} tokens across {len(report['documents'])} documents")
+    sys.exit(1 if report["missing"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from utils.artifact_writer import ArtifactWriter
+from utils.kb_preload import index_sections
+
+DEFAULT_ROOTS = ("kb/playbooks", "kb/examples", "docs")
+
+# Bump when tokenization or the stored shape changes; older indexes are rebuilt.
+INDEX_VERSION = 1
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_][a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the "
+    "this to was were what when where which who will with".split()
+)
+# Heading words count this many times, so a section about X outranks one mentioning X.
+TITLE_WEIGHT = 3
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens without stopwords; hyphenated terms also yield their parts."""
+    tokens = []
+    for match in _TOKEN.finditer(text.lower()):
+        word = match.group()
+        if word in STOPWORDS or len(word) < 2:
+            continue
+        tokens.append(word)
+        if "-" in word or "_" in word:
+            tokens.extend(part for part in re.split(r"[-_]", word) if part not in STOPWORDS and len(part) > 1)
+    return tokens
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One ranked section, addressed by byte offsets into its source file."""
+
+    path: str
+    title: str
+    level: int
+    start: int
+    end: int
+    tokens: int
+    score: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def index_file(path: Path) -> list[dict]:
+    """Section records for one markdown file: offsets, length and term frequencies."""
+    data = path.read_bytes()
+    records = []
+    for section in index_sections(data):
+        text = data[section.body : section.end].decode("utf-8", errors="replace")
+        terms = Counter(tokenize(text))
+        for term in tokenize(section.title):
+            terms[term] += TITLE_WEIGHT
+        if not terms:
+            continue
+        records.append(
+            {
+                "title": section.title,
+                "level": section.level,
+                "start": section.start,
+                "end": section.end,
+                "tokens": section.tokens,
+                "length": sum(terms.values()),
+                "terms": dict(terms),
+            }
+        )
+    return records
+
+
+class KBSearchIndex:
+    """Section-level BM25 index over the kb/ and docs/ markdown trees.
+
+    Every section (heading to next heading, see utils/kb_preload.py) is a
+    document. Per-file records (offsets, length, term frequencies) live in
+    `.idse_cache/kb_search.json` with the (mtime_ns, size) they were built
+    from; `update()` re-indexes only files whose stat changed and drops
+    deleted ones. The postings are derived from those records on the first
+    search and afterwards patched one file at a time. Hits carry byte
+    offsets, so callers can read just the matching section.
+    """
+
+    INDEX_PATH = Path(".idse_cache") / "kb_search.json"
+
+    def __init__(
+        self,
+        base_dir: Path | str = Path("."),
+        roots: Iterable[str] = DEFAULT_ROOTS,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.base_dir = Path(base_dir)
+        self.roots = tuple(roots)
+        self.k1 = k1
+        self.b = b
+        self.index_path = self.base_dir / self.INDEX_PATH
+        self.writer = ArtifactWriter(base_dir=self.base_dir)
+        self._files: dict[str, dict] = self._load()
+        self._lock = threading.Lock()
+        # Postings are built on the first search, then patched per changed file.
+        self._postings: Optional[dict[str, dict[int, int]]] = None
+        self._docs: dict[int, tuple[str, dict]] = {}
+        self._file_docs: dict[str, list[int]] = {}
+        self._doc_ids = itertools.count()
+        self._total_length = 0
+        self.stats = {"indexed": 0, "reused": 0, "removed": 0}
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != INDEX_VERSION or data.get("roots") != list(self.roots):
+            return {}
+        return data.get("files", {})
+
+    def _save(self) -> None:
+        payload = {"version": INDEX_VERSION, "roots": list(self.roots), "files": self._files}
+        try:
+            self.writer.write(self.index_path, json.dumps(payload, separators=(",", ":")))
+        except OSError:
+            pass  # read-only tree: the in-memory index still answers queries
+
+    def _walk(self) -> dict[str, os.stat_result]:
+        found = {}
+        for root in self.roots:
+            top = self.base_dir / root
+            for dirpath, dirnames, filenames in os.walk(top):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if not name.endswith(".md"):
+                        continue
+                    path = Path(dirpath) / name
+                    try:
+                        found[path.relative_to(self.base_dir).as_posix()] = path.stat()
+                    except OSError:
+                        continue
+        return found
+
+    def update(self, rebuild: bool = False) -> dict:
+        """Re-index changed files; return indexed/reused/removed counts for this call."""
+        with self._lock:
+            if rebuild:
+                self._files = {}
+                self._postings, self._docs, self._file_docs, self._total_length = None, {}, {}, 0
+            changes = {"indexed": 0, "reused": 0, "removed": 0}
+            current = self._walk()
+            for rel, st in current.items():
+                entry = self._files.get(rel)
+                if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                    changes["reused"] += 1
+                    continue
+                try:
+                    sections = index_file(self.base_dir / rel)
+                except OSError:
+                    continue
+                self._files[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sections": sections}
+                self._reindex(rel)
+                changes["indexed"] += 1
+            for rel in set(self._files) - set(current):
+                del self._files[rel]
+                self._reindex(rel)
+                changes["removed"] += 1
+            if changes["indexed"] or changes["removed"] or not self.index_path.exists():
+                self._save()
+            for key, value in changes.items():
+                self.stats[key] += value
+            return changes
+
+    def _ensure_postings(self) -> dict[str, dict[int, int]]:
+        if self._postings is None:
+            self._postings = {}
+            for rel in sorted(self._files):
+                self._reindex(rel)
+        return self._postings
+
+    def _reindex(self, rel: str) -> None:
+        """Replace rel's sections in the postings with its current records (none if removed)."""
+        postings = self._postings
+        if postings is None:
+            return
+        for doc_id in self._file_docs.pop(rel, ()):
+            _, record = self._docs.pop(doc_id)
+            self._total_length -= record["length"]
+            for term in record["terms"]:
+                posting = postings[term]
+                del posting[doc_id]
+                if not posting:
+                    del postings[term]
+        entry = self._files.get(rel)
+        if entry is None:
+            return
+        doc_ids = []
+        for record in entry["sections"]:
+            doc_id = next(self._doc_ids)
+            doc_ids.append(doc_id)
+            self._docs[doc_id] = (rel, record)
+            self._total_length += record["length"]
+            for term, tf in record["terms"].items():
+                postings.setdefault(term, {})[doc_id] = tf
+        self._file_docs[rel] = doc_ids
+
+    def sections(self) -> Iterator[tuple[str, dict]]:
+        """(path, record) for every indexed section, in path order."""
+        with self._lock:
+            files = [(rel, self._files[rel]["sections"]) for rel in sorted(self._files)]
+        for rel, sections in files:
+            for record in sections:
+                yield rel, record
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entry["sections"]) for entry in self._files.values())
+
+    def search(self, query: str, k: int = 5, prefix: Optional[str] = None) -> list[SearchHit]:
+        """Top-k sections for query by BM25, optionally only under a path prefix."""
+        terms = set(tokenize(query))
+        # update() patches the postings in place; score against a consistent view.
+        with self._lock:
+            return self._search(terms, k, prefix)
+
+    def _search(self, terms: set[str], k: int, prefix: Optional[str]) -> list[SearchHit]:
+        postings = self._ensure_postings()
+        docs = self._docs
+        count = len(docs)
+        if not terms or not count:
+            return []
+        k1, b = self.k1, self.b
+        norm = b / (self._total_length / count or 1.0)
+        scores: dict[int, float] = {}
+        for term in terms:
+            posting = postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                length = docs[doc_id][1]["length"]
+                weight = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + norm * length))
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        if prefix:
+            scores = {doc_id: s for doc_id, s in scores.items() if docs[doc_id][0].startswith(prefix)}
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        if best:
+            # Doc ids change as files are re-indexed; order ties by path and offset instead.
+            floor = best[-1][1]
+            best = sorted(
+                ((doc_id, score) for doc_id, score in scores.items() if score >= floor),
+                key=lambda item: (-item[1], docs[item[0]][0], docs[item[0]][1]["start"]),
+            )[:k]
+        hits = []
+        for doc_id, score in best:
+            rel, record = docs[doc_id]
+            hits.append(
+                SearchHit(
+                    path=rel,
+                    title=record["title"],
+                    level=record["level"],
+                    start=record["start"],
+                    end=record["end"],
+                    tokens=record["tokens"],
+                    score=round(score, 4),
+                )
+            )
+        return hits
+
+    def read(self, hit: SearchHit) -> str:
+        """The section text for a hit, read by offset (the file may have changed since indexing)."""
+        with open(self.base_dir / hit.path, "rb") as handle:
+            handle.seek(hit.start)
+            return handle.read(hit.end - hit.start).decode("utf-8", errors="replace")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search kb/ and docs/ sections with BM25")
+    parser.add_argument("query", nargs="+")
+    parser.add_argument("-k", type=int, default=5, help="Number of sections to return")
+    parser.add_argument("--base-dir", default=".")
+    parser.add_argument("--prefix", help="Only sections under this path prefix (e.g. kb/playbooks)")
+    parser.add_argument("--show", action="store_true", help="Print each section's text")
+    parser.add_argument("--rebuild", action="store_true", help="Discard the cached index first")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    index = KBSearchIndex(args.base_dir)
+    index.update(rebuild=args.rebuild)
+    hits = index.search(" ".join(args.query), k=args.k, prefix=args.prefix)
+
+    if args.json:
+        results = []
+        for hit in hits:
+            result = hit.to_dict()
+            if args.show:
+                result["text"] = index.read(hit)
+            results.append(result)
+        print(json.dumps({"query": " ".join(args.query), "hits": results}, indent=2))
+        return
+
+    if not hits:
+        print("No matching sections.")
+        sys.exit(1)
+    for hit in hits:
+        print(f"{hit.score:7.3f}  {hit.path}:{hit.start}-{hit.end}  {hit.title or '(preamble)'}  (~{hit.tokens} tokens)")
+        if args.show:
+            print(index.read(hit).rstrip() + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import mmap
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+REQUIRES_INPUT = b"[REQUIRES INPUT]"
+DRAFT_MARKER = b"[DRAFT - PENDING AGENCY REVIEW]"
+
+# Newlines are counted in fixed windows so memory stays flat however far
+# apart two markers are.
+_COUNT_WINDOW = 1 << 20
+
+
+@dataclass
+class MarkerScan:
+    """Markers found in one artifact."""
+
+    unresolved_count: int = 0  # lines containing [REQUIRES INPUT]
+    draft: bool = False
+    issues: list[tuple[int, str]] = field(default_factory=list)
+
+
+def _count_newlines(buf, start: int, end: int) -> int:
+    count = 0
+    while start < end:
+        stop = min(start + _COUNT_WINDOW, end)
+        count += buf[start:stop].count(b"\n")
+        start = stop
+    return count
+
+
+def scan_buffer(buf, max_issues: Optional[int] = None) -> MarkerScan:
+    """Scan a bytes-like buffer (bytes or mmap) for both markers.
+
+    max_issues=0 is the count-only fast path; None collects every issue
+    line, like find_requires_input; N keeps the first N with line numbers.
+    """
+    result = MarkerScan(draft=buf.find(DRAFT_MARKER) != -1)
+    collect = max_issues is None or max_issues > 0
+    line_no = 1
+    counted_to = 0
+    pos = buf.find(REQUIRES_INPUT)
+    while pos != -1:
+        result.unresolved_count += 1
+        line_end = buf.find(b"\n", pos)
+        if collect and (max_issues is None or len(result.issues) < max_issues):
+            line_start = buf.rfind(b"\n", 0, pos) + 1
+            line_no += _count_newlines(buf, counted_to, line_start)
+            counted_to = line_start
+            text = buf[line_start : line_end if line_end != -1 else len(buf)]
+            result.issues.append((line_no, text.decode("utf-8", errors="replace").strip()))
+        if line_end == -1:
+            break
+        # One issue per line, however many markers it holds.
+        pos = buf.find(REQUIRES_INPUT, line_end)
+    return result
+
+
+def scan_markers(path: Path | str, max_issues: Optional[int] = None) -> MarkerScan:
+    """Scan an artifact file through a read-only memory map."""
+    with open(path, "rb") as handle:
+        try:
+            buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            return MarkerScan()
+        with buf:
+            return scan_buffer(buf, max_issues=max_issues)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Seconds; spans sub-millisecond file lookups up to slow GitHub round trips.
+DEFAULT_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class _State:
+    enabled = False
+
+
+STATE = _State()
+
+
+class Histogram:
+    """Prometheus-style histogram with a fixed label set."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        result = []
+        for key, series in sorted(items):
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets, series):
+                running += count
+                cumulative[repr(bound)] = running
+            cumulative["+Inf"] = series[-1]
+            result.append(
+                {
+                    "labels": dict(zip(self.labelnames, key)),
+                    "buckets": cumulative,
+                    "sum": series[-2],
+                    "count": series[-1],
+                }
+            )
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Registry:
+    def __init__(self):
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Histogram:
+        with self._lock:
+            existing = self._histograms.get(name)
+            if existing is None:
+                existing = self._histograms[name] = Histogram(name, help_text, labelnames)
+            return existing
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for hist in sorted(self._histograms.values(), key=lambda h: h.name):
+            lines.append(f"# HELP {hist.name} {hist.help}")
+            lines.append(f"# TYPE {hist.name} histogram")
+            for series in hist.snapshot():
+                labels = [f'{k}="{_escape(v)}"' for k, v in series["labels"].items()]
+                for bound, count in series["buckets"].items():
+                    le = ",".join(labels + [f'le="{bound}"'])
+                    lines.append(f"{hist.name}_bucket{{{le}}} {count}")
+                suffix = "{" + ",".join(labels) + "}" if labels else ""
+                lines.append(f"{hist.name}_sum{suffix} {series['sum']:.6f}")
+                lines.append(f"{hist.name}_count{suffix} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict:
+        return {
+            hist.name: {"help": hist.help, "series": hist.snapshot()}
+            for hist in sorted(self._histograms.values(), key=lambda h: h.name)
+        }
+
+    def reset(self) -> None:
+        for hist in self._histograms.values():
+            hist.reset()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = Registry()
+
+GITHUB_API_SECONDS = REGISTRY.histogram(
+    "idse_github_api_seconds", "GitHub API call latency", ("operation",)
+)
+SUBPROCESS_SECONDS = REGISTRY.histogram(
+    "idse_subprocess_seconds", "Subprocess (git) call latency", ("command",)
+)
+GUARDRAIL_SECONDS = REGISTRY.histogram(
+    "idse_guardrail_seconds", "Guardrail evaluation latency", ("layer",)
+)
+RESOLUTION_SECONDS = REGISTRY.histogram(
+    "idse_file_resolution_seconds", "Session and artifact path resolution latency", ("kind",)
+)
+COMMIT_SECONDS = REGISTRY.histogram(
+    "idse_commit_artifacts_seconds", "End-to-end GitService.commit_artifacts latency"
+)
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def enable(on: bool = True) -> None:
+    STATE.enabled = on
+
+
+def enabled() -> bool:
+    return STATE.enabled
+
+
+def span(histogram: Histogram, **labels: str):
+    """Time a block into histogram; a shared no-op when metrics are disabled."""
+    if not STATE.enabled:
+        return _NOOP
+    return histogram.time(**labels)
+
+
+def timed(histogram: Histogram, **labels: str) -> Callable:
+    """Decorator form of span(); disabled cost is one attribute check."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not STATE.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, **labels)
+
+        return wrapper
+
+    return decorator
+
+
+def write_json(path: Path | str) -> None:
+    """Dump all histograms to path as JSON (the CLI-side exporter)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"generated_at": time.time(), "metrics": REGISTRY.to_dict()}, indent=2))
+    os.replace(tmp, path)
+
+
+def _configure_from_env() -> None:
+    """IDSE_METRICS=1 turns collection on; IDSE_METRICS_JSON=<path> also dumps at exit."""
+    if os.getenv("IDSE_METRICS", "0") == "1":
+        enable()
+    json_path = os.getenv("IDSE_METRICS_JSON")
+    if json_path:
+        enable()
+        atexit.register(write_json, json_path)
+
+
+_configure_from_env()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from utils.marker_scanner import scan_buffer
+
+# Bump whenever marker semantics or the cached record shape change; older
+# rows then simply stop matching.
+VALIDATOR_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifact_results (
+    digest TEXT NOT NULL,
+    version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (digest, version)
+)
+"""
+
+
+class ValidationCache:
+    """Persistent artifact validation results keyed by content hash.
+
+    Stores the marker scan of an artifact (unresolved_count, issues, draft)
+    under (BLAKE2b of the file bytes, VALIDATOR_VERSION), so unchanged
+    artifacts are answered without re-parsing, whatever their path or mtime.
+    """
+
+    DEFAULT_PATH = Path(".idse_cache") / "validation.sqlite3"
+
+    def __init__(self, db_path: Path | str, version: str = VALIDATOR_VERSION):
+        self.db_path = Path(db_path)
+        self.version = version
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @classmethod
+    def open(cls, base_dir: Path | str) -> Optional["ValidationCache"]:
+        """Open the cache under base_dir, or None if it can't be created (read-only tree)."""
+        try:
+            return cls(Path(base_dir) / cls.DEFAULT_PATH)
+        except (OSError, sqlite3.Error):
+            return None
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    def get(self, digest: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM artifact_results WHERE digest = ? AND version = ?",
+                (digest, self.version),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, digest: str, result: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifact_results (digest, version, result) VALUES (?, ?, ?)",
+                (digest, self.version, json.dumps(result)),
+            )
+
+    def scan(self, path: Path | str) -> dict:
+        """Return {unresolved_count, issues, draft} for path, from cache when possible.
+
+        The file is read once and both the digest and the scan use those
+        bytes, so a concurrent rewrite cannot cache one version's result
+        under the other's digest.
+        """
+        data = Path(path).read_bytes()
+        digest = self.digest(data)
+        cached = self.get(digest)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+
+        self.stats["misses"] += 1
+        scan = scan_buffer(data)
+        result = {
+            "unresolved_count": scan.unresolved_count,
+            "issues": [list(issue) for issue in scan.issues],
+            "draft": scan.draft,
+        }
+        self.put(digest, result)
+        return result
+
+    def close(self) -> None:
+        self._conn.close()
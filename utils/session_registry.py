@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from session_reader import ActiveSession, SessionReader
+
+DEFAULT_DB_PATH = Path(".idse_cache") / "sessions.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    project TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    name TEXT,
+    owner TEXT,
+    stage TEXT,
+    created_at REAL,
+    extra TEXT NOT NULL DEFAULT '{}',
+    updated_at REAL NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    seq INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project, session_id)
+);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions(updated_at);
+CREATE INDEX IF NOT EXISTS sessions_owner ON sessions(owner);
+CREATE INDEX IF NOT EXISTS sessions_stage ON sessions(stage);
+CREATE INDEX IF NOT EXISTS sessions_session_id ON sessions(session_id);
+"""
+
+_COLUMNS = "project, session_id, name, owner, stage, created_at, extra, updated_at"
+
+SessionKey = tuple[str, str]  # (project, session_id)
+
+# Removed sessions stay as tombstones this long so other processes see the delete.
+TOMBSTONE_SECONDS = 86400.0
+
+
+class SessionRegistry:
+    """Every known session, persisted in SQLite and indexed in memory.
+
+    `.idse_active_session.json` names one session per working tree; the
+    backend serves many at once, so it registers them here instead. Rows
+    are mirrored into dicts keyed by (project, session_id) with secondary
+    indexes by project, session id, owner and stage, so lookups and
+    filtered queries never touch SQLite. Writes go to SQLite first.
+
+    Other processes sharing the database are noticed through SQLite's
+    `PRAGMA data_version`, which changes whenever another connection
+    commits; only rows with a higher `seq` than any already mirrored are
+    then read back. Every write transaction takes SQLite's write lock
+    first and stamps its rows with MAX(seq) + 1, so seqs follow commit
+    order whatever the wall clock says. Removals are tombstones for the
+    same reason.
+    """
+
+    INDEXED = ("project", "session_id", "owner", "stage")
+
+    def __init__(self, db_path: Path | str = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        # The newest row stays, so MAX(seq) never goes back and reuses a seen seq.
+        self._conn.execute(
+            "DELETE FROM sessions WHERE deleted = 1 AND updated_at < ? "
+            "AND seq < (SELECT MAX(seq) FROM sessions)",
+            (time.time() - TOMBSTONE_SECONDS,),
+        )
+        self._lock = threading.RLock()
+        self._sessions: dict[SessionKey, ActiveSession] = {}
+        self._updated: dict[SessionKey, float] = {}
+        self._order: dict[SessionKey, int] = {}  # write order, for newest-first results
+        self._counter = itertools.count()
+        self._indexes: dict[str, dict[Optional[str], set[SessionKey]]] = {}
+        self._data_version = None
+        self._high_water = 0
+        self.stats = {"lookups": 0, "queries": 0, "writes": 0, "reloads": 0, "syncs": 0}
+        self._reload()
+
+    def _migrate(self) -> None:
+        """Add and backfill the seq column on databases created before it."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+            if "seq" not in columns:
+                self._conn.execute("ALTER TABLE sessions ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute("UPDATE sessions SET seq = rowid")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_seq ON sessions(seq)")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    # -- in-memory mirror -------------------------------------------------
+
+    def _reload(self) -> None:
+        self._conn.execute("BEGIN")  # one snapshot for the rows and the high-water seq
+        try:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM sessions WHERE deleted = 0 ORDER BY seq, rowid"
+            ).fetchall()
+            (self._high_water,) = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM sessions"
+            ).fetchone()
+            self._data_version = self._version()
+        finally:
+            self._conn.execute("COMMIT")
+        self._sessions.clear()
+        self._updated.clear()
+        self._order.clear()
+        self._indexes = {field: {} for field in self.INDEXED}
+        for row in rows:
+            self._add(*_from_row(row))
+        self.stats["reloads"] += 1
+
+    def _version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync(self) -> None:
+        """Apply rows another connection changed since we last looked."""
+        version = self._version()
+        if version == self._data_version:
+            return
+        rows = self._conn.execute(
+            f"SELECT {_COLUMNS}, deleted, seq FROM sessions WHERE seq > ? ORDER BY seq, rowid",
+            (self._high_water,),
+        ).fetchall()
+        for row in rows:
+            if row[-2]:
+                self._discard((row[0], row[1]))
+            else:
+                self._add(*_from_row(row[:-2]))
+            self._high_water = max(self._high_water, row[-1])
+        self._data_version = version
+        self.stats["syncs"] += 1
+
+    @contextmanager
+    def _writing(self) -> Iterator[int]:
+        """A write transaction, caught up with other writers; yields the seq for its rows.
+
+        Our own commits leave data_version alone, so a commit by someone
+        else right after ours is still noticed on the next sync.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                (seq,) = self._conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM sessions").fetchone()
+                yield seq
+                # Not seq itself: a write that matched no row must not move past it.
+                (high_water,) = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sessions").fetchone()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._high_water = high_water
+
+    def _add(self, session: ActiveSession, updated_at: float) -> None:
+        key = (session.project, session.session_id)
+        self._discard(key)
+        self._sessions[key] = session
+        self._updated[key] = updated_at
+        self._order[key] = next(self._counter)
+        for field in self.INDEXED:
+            self._indexes[field].setdefault(getattr(session, field), set()).add(key)
+
+    def _discard(self, key: SessionKey) -> None:
+        session = self._sessions.pop(key, None)
+        self._updated.pop(key, None)
+        self._order.pop(key, None)
+        if session is None:
+            return
+        for field in self.INDEXED:
+            bucket = self._indexes[field].get(getattr(session, field))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._indexes[field][getattr(session, field)]
+
+    # -- writes -----------------------------------------------------------
+
+    def register(self, session: ActiveSession | Mapping[str, Any]) -> ActiveSession:
+        """Insert or replace a session; raises ValueError on invalid metadata."""
+        if not isinstance(session, ActiveSession):
+            session = ActiveSession.from_mapping(session)
+        now = time.time()
+        with self._lock:
+            with self._writing() as seq:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO sessions ({_COLUMNS}, seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*_to_row(session, now), seq),
+                )
+            self._add(session, now)
+            self.stats["writes"] += 1
+        return session
+
+    def register_many(self, sessions: Iterable[ActiveSession | Mapping[str, Any]]) -> int:
+        """Register sessions in one transaction; returns how many were written."""
+        parsed = [s if isinstance(s, ActiveSession) else ActiveSession.from_mapping(s) for s in sessions]
+        now = time.time()
+        with self._lock:
+            with self._writing() as seq:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO sessions ({_COLUMNS}, seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(*_to_row(session, now), seq) for session in parsed],
+                )
+            for session in parsed:
+                self._add(session, now)
+            self.stats["writes"] += len(parsed)
+        return len(parsed)
+
+    def update(self, project: str, session_id: str, changes: Mapping[str, Any]) -> Optional[ActiveSession]:
+        """Change fields (stage, owner, name, ...) of a registered session; None if unknown.
+
+        A field set to None is dropped; project and session_id are fixed.
+        """
+        with self._lock:
+            current = self.get(project, session_id)
+            if current is None:
+                return None
+            data = current.to_dict()
+            data.update(changes)
+            if data.get("project") != project or data.get("session_id") != session_id:
+                raise ValueError("project and session_id cannot be changed")
+            return self.register({k: v for k, v in data.items() if v is not None})
+
+    def set_stage(self, project: str, session_id: str, stage: str) -> Optional[ActiveSession]:
+        return self.update(project, session_id, {"stage": stage})
+
+    def remove(self, project: str, session_id: str) -> bool:
+        now = time.time()
+        with self._lock:
+            with self._writing() as seq:
+                cursor = self._conn.execute(
+                    "UPDATE sessions SET deleted = 1, updated_at = ?, seq = ? "
+                    "WHERE project = ? AND session_id = ? AND deleted = 0",
+                    (now, seq, project, session_id),
+                )
+            self._discard((project, session_id))
+            self.stats["writes"] += 1
+            return cursor.rowcount > 0
+
+    def import_marker(self, base_dir: Path | str = Path(".")) -> Optional[ActiveSession]:
+        """Register the session named by `.idse_active_session.json` under base_dir, if any."""
+        session = SessionReader.get_session(base_dir=base_dir)
+        return self.register(session) if session else None
+
+    # -- reads ------------------------------------------------------------
+
+    def get(self, project: str, session_id: str) -> Optional[ActiveSession]:
+        with self._lock:
+            self._sync()
+            self.stats["lookups"] += 1
+            return self._sessions.get((project, session_id))
+
+    def query(
+        self,
+        project: Optional[str] = None,
+        session_id: Optional[str] = None,
+        owner: Optional[str] = None,
+        stage: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[ActiveSession]:
+        """Sessions matching every given field, most recently updated first."""
+        filters = {
+            field: value
+            for field, value in zip(self.INDEXED, (project, session_id, owner, stage))
+            if value is not None
+        }
+        with self._lock:
+            self._sync()
+            self.stats["queries"] += 1
+            if filters:
+                # Intersect from the smallest bucket so selective filters stay cheap.
+                buckets = sorted(
+                    (self._indexes[field].get(value, set()) for field, value in filters.items()),
+                    key=len,
+                )
+                keys = set(buckets[0]).intersection(*buckets[1:])
+            else:
+                keys = set(self._sessions)
+            if limit is not None and limit < len(keys):
+                ordered = heapq.nlargest(limit, keys, key=self._order.__getitem__)
+            else:
+                ordered = sorted(keys, key=self._order.__getitem__, reverse=True)
+            return [self._sessions[key] for key in ordered]
+
+    def counts(self, field: str) -> dict[Optional[str], int]:
+        """Number of sessions per value of an indexed field (e.g. per stage)."""
+        if field not in self.INDEXED:
+            raise ValueError(f"Not an indexed field: {field}")
+        with self._lock:
+            self._sync()
+            return {value: len(keys) for value, keys in self._indexes[field].items()}
+
+    def updated_at(self, project: str, session_id: str) -> Optional[float]:
+        with self._lock:
+            return self._updated.get((project, session_id))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._sessions)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _to_row(session: ActiveSession, updated_at: float) -> tuple:
+    return (
+        session.project,
+        session.session_id,
+        session.name,
+        session.owner,
+        session.stage,
+        session.created_at,
+        json.dumps(dict(session.extra), sort_keys=True),
+        updated_at,
+    )
+
+
+def _from_row(row: tuple) -> tuple[ActiveSession, float]:
+    project, session_id, name, owner, stage, created_at, extra, updated_at = row
+    session = ActiveSession(
+        session_id=session_id,
+        project=project,
+        name=name,
+        owner=owner,
+        created_at=created_at,
+        stage=stage,
+        extra=MappingProxyType(json.loads(extra or "{}")),
+    )
+    return session, updated_at
+
+
+_REGISTRY: Optional[SessionRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_session_registry() -> SessionRegistry:
+    """Return the process-wide registry (IDSE_SESSION_REGISTRY_DB overrides the path)."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = SessionRegistry(os.getenv("IDSE_SESSION_REGISTRY_DB", str(DEFAULT_DB_PATH)))
+        return _REGISTRY
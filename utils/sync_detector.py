@@ -1,23 +1,33 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import subprocess
 from pathlib import Path
 from typing import List, Optional
 
 from session_reader import SessionReader
+from utils.metrics import SUBPROCESS_SECONDS, span
+
+
+# Starts each commit header in `git log --name-only` output, so commit lines
+# can't be confused with file names.
+COMMIT_MARKER = "\x1e"
+STAGES = ["intents", "contexts", "specs", "plans", "tasks"]
 
 
 class SyncDetector:
     """Detect Agency commits affecting the active session's artifacts."""
 
+    WATERMARK_DIR = Path(".idse_cache") / "sync"
+
     def __init__(self, base_dir: Path | str = Path(".")):
         self.base_dir = Path(base_dir)
 
     def _session_paths(self, session: dict) -> List[Path]:
         project = session["project"]
         session_id = session["session_id"]
-        stages = ["intents", "contexts", "specs", "plans", "tasks"]
         return [
             self.base_dir
             / stage
@@ -25,18 +35,21 @@ class SyncDetector:
             / project
             / "sessions"
             / session_id
-            for stage in stages
+            for stage in STAGES
         ]
 
+    def _git(self, args: list[str]) -> subprocess.CompletedProcess:
+        with span(SUBPROCESS_SECONDS, command=f"git {args[0]}"):
+            return subprocess.run(
+                ["git", *args],
+                cwd=self.base_dir,
+                check=False,
+                capture_output=True,
+                text=True,
+            )
+
     def _run_git(self, args: list[str]) -> str:
-        result = subprocess.run(
-            ["git", *args],
-            cwd=self.base_dir,
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-        return result.stdout.strip()
+        return self._git(args).stdout.strip()
 
     def detect_agency_updates(self) -> dict:
         session = SessionReader.get_active_session(base_dir=self.base_dir)
@@ -78,6 +91,108 @@ class SyncDetector:
         output = self._run_git(cmd_args)
         return [line for line in output.splitlines() if line.strip()]
 
+    def _watermark_path(self, session: dict) -> Path:
+        name = f"{session['project']}__{session['session_id']}.json"
+        return self.base_dir / self.WATERMARK_DIR / name
+
+    def read_watermark(self, session: dict) -> dict:
+        """Return {"head": <last scanned HEAD>, "commit": <last session commit>}."""
+        try:
+            data = json.loads(self._watermark_path(session).read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def write_watermark(self, session: dict, head: str, commit: Optional[str]) -> None:
+        path = self._watermark_path(session)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"head": head, "commit": commit}))
+        os.replace(tmp, path)
+
+    def _log_with_names(self, args: list[str]) -> Optional[list[dict]]:
+        """Commits (newest first) with their changed files, from one git log call."""
+        result = self._git(
+            ["log", f"--format={COMMIT_MARKER}%H|%an|%ar|%s", "--name-only", *args]
+        )
+        if result.returncode != 0:
+            return None
+
+        commits = []
+        for block in result.stdout.split(COMMIT_MARKER)[1:]:
+            header, _, names = block.partition("\n")
+            commit_hash, author, time_ago, message = header.split("|", maxsplit=3)
+            commits.append(
+                {
+                    "hash": commit_hash,
+                    "commit": commit_hash[:7],
+                    "author": author,
+                    "time_ago": time_ago,
+                    "message": message,
+                    "files": [line for line in names.splitlines() if line.strip()],
+                }
+            )
+        return commits
+
+    def detect_new_commits(self) -> dict:
+        """Report commits touching the session since the last call.
+
+        The HEAD scanned last time is kept as a per-session watermark under
+        `.idse_cache/sync/`. Later calls run a single `git log --name-only
+        watermark..HEAD`, which walks only the new commits, and keep the ones
+        touching session paths. When nothing is new, nothing is reported. The
+        first call, or one whose watermark no longer resolves (e.g. after a
+        history rewrite), reports just the latest session commit, like
+        detect_agency_updates().
+        """
+        session = SessionReader.get_active_session(base_dir=self.base_dir)
+        if not session:
+            return {"has_updates": False, "reason": "no_session"}
+
+        prefixes = tuple(
+            f"{stage}/projects/{session['project']}/sessions/{session['session_id']}/"
+            for stage in STAGES
+        )
+        state = self.read_watermark(session)
+        commits = None
+        if state.get("head"):
+            # --relative: file names relative to base_dir, matching the prefixes.
+            log = self._log_with_names([f"{state['head']}..HEAD", "--relative"])
+            if log is not None:
+                head = log[0]["hash"] if log else state["head"]
+                commits = []
+                for commit in log:
+                    commit["files"] = [f for f in commit["files"] if f.startswith(prefixes)]
+                    if commit["files"]:
+                        commits.append(commit)
+
+        if commits is None:
+            state = {}
+            head = self._run_git(["rev-parse", "--verify", "HEAD"])
+            paths = [str(p) for p in self._session_paths(session)]
+            commits = self._log_with_names(["-1", "--relative", "--", *paths]) or []
+
+        if head:
+            self.write_watermark(
+                session, head, commits[0]["hash"] if commits else state.get("commit")
+            )
+        if not commits:
+            reason = "no_new_commits" if state else "no_commits"
+            return {"has_updates": False, "reason": reason}
+
+        latest = commits[0]
+        changed = sorted({name for commit in commits for name in commit["files"]})
+        return {
+            "has_updates": True,
+            "commit": latest["commit"],
+            "author": latest["author"],
+            "time_ago": latest["time_ago"],
+            "message": latest["message"],
+            "commits": commits,
+            "changed_artifacts": changed,
+            "session": session,
+        }
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -88,9 +203,18 @@ def main():
         action="store_true",
         help="List files changed in the latest Agency commit.",
     )
+    parser.add_argument(
+        "--since-last",
+        action="store_true",
+        help="Only report commits since the last --since-last run (watermark in .idse_cache/).",
+    )
     args = parser.parse_args()
 
     detector = SyncDetector()
+    if args.since_last:
+        report_new_commits(detector.detect_new_commits(), args.show_changes)
+        return
+
     result = detector.detect_agency_updates()
 
     if not result.get("has_updates"):
@@ -112,5 +236,24 @@ def main():
             print("  Changed artifacts: none reported")
 
 
+def report_new_commits(result: dict, show_changes: bool) -> None:
+    if not result.get("has_updates"):
+        reason = result.get("reason", "none")
+        print(f"✓ No new Agency updates ({reason}).")
+        return
+
+    print(f"✓ {len(result['commits'])} new Agency commit(s):")
+    for commit in result["commits"]:
+        print(f"  {commit['commit']} by {commit['author']} ({commit['time_ago']}): {commit['message']}")
+
+    if show_changes:
+        if result["changed_artifacts"]:
+            print("  Changed artifacts:")
+            for path in result["changed_artifacts"]:
+                print(f"   - {path}")
+        else:
+            print("  Changed artifacts: none reported")
+
+
 if __name__ == "__main__":
     main()
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from pathlib import Path
 
 from session_reader import SessionReader
+from utils.artifact_writer import ArtifactWriter
+from utils.marker_scanner import DRAFT_MARKER
+
+# Regenerating a draft only moves this timestamp; it does not count as a change.
+GENERATED_LINE = re.compile(rb"^Generated locally on \d{4}-\d\d-\d\dT[\d:.]+Z\.$", re.MULTILINE)
 
 
 class TemplateWriter:
     """Create simple draft artifacts for offline/hybrid mode."""
 
-    DRAFT_MARKER = "[DRAFT - PENDING AGENCY REVIEW]"
+    DRAFT_MARKER = DRAFT_MARKER.decode("ascii")
 
     def __init__(self, base_dir: Path | str = Path(".")):
         self.base_dir = Path(base_dir)
+        self.writer = ArtifactWriter(base_dir=self.base_dir)
 
-    def _write(self, path: Path, content: str) -> Path:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(content)
+    def _write(self, path: Path, content: str, session: dict | None = None) -> Path:
+        self.writer.write(path, content, session=session, ignore=GENERATED_LINE)
         return path
 
     def create_intent_draft(self, description: str) -> Path:
@@ -37,7 +43,7 @@ class TemplateWriter:
 Generated locally on {datetime.utcnow().isoformat()}Z.
 Sync with the Agency to refine and approve.
 """
-        return self._write(path, body)
+        return self._write(path, body, session)
 
     def create_spec_draft(self, intent_summary: str) -> Path:
         session = SessionReader.get_active_session(base_dir=self.base_dir)
@@ -60,7 +66,7 @@ Sync with the Agency to refine and approve.
 Generated locally on {datetime.utcnow().isoformat()}Z.
 Sync with the Agency for full specification generation.
 """
-        return self._write(path, body)
+        return self._write(path, body, session)
 
     def _resolve_path(self, stage: str, filename: str, session: dict | None) -> Path:
         if session: